@@ -3,7 +3,7 @@
 __version__ = "0.3.2"
 
 from sweatpants.sdk.module import Module
-from sweatpants.proxy.client import proxied_request
+from sweatpants.proxy.client import proxied_request, proxied_stream
 from sweatpants.browser.pool import get_browser
 
-__all__ = ["Module", "proxied_request", "get_browser", "__version__"]
+__all__ = ["Module", "proxied_request", "proxied_stream", "get_browser", "__version__"]
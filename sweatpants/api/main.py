@@ -1,50 +1,82 @@
 """FastAPI application factory."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
+from urllib.parse import urlsplit
 
 from fastapi import FastAPI
 
+from sweatpants.api.responses import ORJSONResponse
+from sweatpants.api.routes import router
 from sweatpants.api.scheduler import get_scheduler
-from sweatpants.browser.pool import shutdown_pool
-from sweatpants.engine.module_loader import ModuleLoader
-from sweatpants.proxy.client import build_proxy_url
+from sweatpants.browser.pool import prewarm_pool, shutdown_pool
+from sweatpants.config import get_settings
+from sweatpants.engine.state import close_database, maintain_database
+from sweatpants.proxy.client import build_proxy_url, close_client
+
+
+async def _prewarm_browsers() -> None:
+    """Start the default browser pool in the background."""
+    try:
+        await prewarm_pool()
+        print("Browser pool ready")
+    except Exception as e:
+        print(f"Warning: browser pool pre-warm failed: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan handler."""
+    sched = get_scheduler()
+
     try:
         proxy_url = build_proxy_url()
-        proxy_host = proxy_url.split("@")[1] if "@" in proxy_url else proxy_url
+        # Report only host:port so credentials never reach the logs; fall back
+        # to the raw value for scheme-less URLs that urlsplit can't parse.
+        netloc = urlsplit(proxy_url).netloc or proxy_url
+        proxy_host = netloc.rpartition("@")[2]
         print(f"Proxy configured: {proxy_host}")
     except RuntimeError as e:
         print(f"Warning: {e} (modules requiring proxy will fail at runtime)")
 
-    loader = ModuleLoader()
-    discovered = await loader.discover_modules()
+    discovered = await sched.module_loader.discover_modules()
     if discovered > 0:
         print(f"Auto-installed {discovered} discovered module(s)")
 
-    sched = get_scheduler()
     resumed = await sched.resume_interrupted_jobs()
     if resumed > 0:
         print(f"Resumed {resumed} interrupted job(s)")
 
-    yield
+    # Launch browsers while the server finishes starting rather than on the
+    # first request that needs one.
+    prewarm = None
+    if get_settings().browser_prewarm:
+        prewarm = asyncio.create_task(_prewarm_browsers())
+
+    maintenance = asyncio.create_task(maintain_database())
 
-    await shutdown_pool()
+    try:
+        yield
+    finally:
+        if prewarm is not None:
+            prewarm.cancel()
+        maintenance.cancel()
+        # Jobs go first: a cancelled job still records its final status.
+        await sched.close(timeout=get_settings().shutdown_timeout)
+        await shutdown_pool()
+        await close_client()
+        await close_database()
 
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
-    from sweatpants.api.routes import router
-
     app = FastAPI(
         title="Sweatpants",
         description="Server-side automation engine for long-running tasks",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.include_router(router)
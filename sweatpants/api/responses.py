@@ -0,0 +1,17 @@
+"""Response classes for the Sweatpants API."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Non-native types (datetimes, UUIDs, ...) are handled by orjson itself;
+    anything else falls back to ``str``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str)
@@ -3,16 +3,50 @@
 import asyncio
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
-from pydantic import BaseModel
-
-from sweatpants.api.scheduler import get_scheduler
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError, field_validator
+
+from sweatpants.api.responses import ORJSONResponse
+from sweatpants.api.scheduler import get_module_loader, get_scheduler, get_state_manager
+from sweatpants.engine.job_scheduler import LogQueue
 from sweatpants.engine.module_loader import ModuleLoader
 from sweatpants.engine.state import StateManager
 from sweatpants.proxy.client import proxied_request
+from sweatpants.utils import AsyncTTLCache
 
 router = APIRouter()
 
+# Queued log batches are coalesced into one WebSocket frame until it holds
+# at least this many entries.
+LOG_BATCH_SIZE = 128
+
+# Seconds without a log frame before a keepalive ping is sent.
+PING_INTERVAL = 30.0
+
+_PING = orjson.dumps({"type": "ping"})
+
+# Short-lived caches for read endpoints that dashboards poll; concurrent
+# pollers within the TTL share one lookup.
+_status_cache = AsyncTTLCache(ttl=1.0, maxsize=1)
+_modules_cache = AsyncTTLCache(ttl=1.0, maxsize=1)
+_jobs_cache = AsyncTTLCache(ttl=1.0, maxsize=16)
+_job_cache = AsyncTTLCache(ttl=0.5, maxsize=1024)
+
+
+def _invalidate_job_caches() -> None:
+    """Drop cached job and status reads after a job changes state."""
+    _status_cache.clear()
+    _jobs_cache.clear()
+    _job_cache.clear()
+
+
+def _invalidate_module_caches() -> None:
+    """Drop cached module and status reads after modules change."""
+    _status_cache.clear()
+    _modules_cache.clear()
+
 
 class JobCreateRequest(BaseModel):
     """Request body for creating a job."""
@@ -48,6 +82,15 @@ class ProxyFetchRequest(BaseModel):
     session_id: Optional[str] = None
     geo: Optional[str] = None
 
+    @field_validator("geo")
+    @classmethod
+    def _reject_geo(cls, value: Optional[str]) -> Optional[str]:
+        # Accepted as null for existing clients, but the proxy client has no
+        # geo targeting, so a value would be silently ignored.
+        if value is not None:
+            raise ValueError("geo targeting is not supported for proxy fetches")
+        return value
+
 
 class ProxyFetchResponse(BaseModel):
     """Response body from proxy fetch endpoint."""
@@ -72,21 +115,19 @@ class CallbackRequest(BaseModel):
 async def get_status() -> dict:
     """Get engine status and running jobs."""
     scheduler = get_scheduler()
-    return await scheduler.get_status()
+    return await _status_cache.get(None, scheduler.get_status)
 
 
 @router.get("/modules")
-async def list_modules() -> dict:
+async def list_modules(loader: ModuleLoader = Depends(get_module_loader)) -> dict:
     """List installed modules."""
-    loader = ModuleLoader()
-    modules = await loader.list()
+    modules = await _modules_cache.get(None, loader.list)
     return {"modules": modules}
 
 
 @router.get("/modules/{module_id}")
-async def get_module(module_id: str) -> dict:
+async def get_module(module_id: str, loader: ModuleLoader = Depends(get_module_loader)) -> dict:
     """Get module details."""
-    loader = ModuleLoader()
     module = await loader.get(module_id)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
@@ -94,9 +135,11 @@ async def get_module(module_id: str) -> dict:
 
 
 @router.post("/modules/install")
-async def install_module(request: ModuleInstallRequest) -> dict:
+async def install_module(
+    request: ModuleInstallRequest,
+    loader: ModuleLoader = Depends(get_module_loader),
+) -> dict:
     """Install a module from a directory."""
-    loader = ModuleLoader()
     try:
         manifest = await loader.install(request.source_path)
         return {
@@ -108,12 +151,16 @@ async def install_module(request: ModuleInstallRequest) -> dict:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_module_caches()
 
 
 @router.post("/modules/install-git")
-async def install_module_git(request: ModuleInstallGitRequest) -> dict:
+async def install_module_git(
+    request: ModuleInstallGitRequest,
+    loader: ModuleLoader = Depends(get_module_loader),
+) -> dict:
     """Install a module from a git repository."""
-    loader = ModuleLoader()
     try:
         manifest = await loader.install_from_git(
             repo_url=request.repo_url,
@@ -130,20 +177,25 @@ async def install_module_git(request: ModuleInstallGitRequest) -> dict:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_module_caches()
 
 
 @router.delete("/modules/{module_id}")
-async def uninstall_module(module_id: str) -> dict:
+async def uninstall_module(
+    module_id: str,
+    loader: ModuleLoader = Depends(get_module_loader),
+) -> dict:
     """Uninstall a module."""
-    loader = ModuleLoader()
     success = await loader.uninstall(module_id)
+    _invalidate_module_caches()
     if not success:
         raise HTTPException(status_code=404, detail="Module not found")
     return {"status": "uninstalled", "module_id": module_id}
 
 
 @router.post("/modules/sync")
-async def sync_modules() -> dict:
+async def sync_modules(loader: ModuleLoader = Depends(get_module_loader)) -> dict:
     """Sync modules from configured module sources.
 
     Reads module_sources from modules.yaml config file, clones/pulls each repo,
@@ -152,7 +204,6 @@ async def sync_modules() -> dict:
     Returns summary with installed, failed, and skipped modules.
     Raises 400 if no module_sources configured.
     """
-    loader = ModuleLoader()
     try:
         result = await loader.sync_modules()
         return result
@@ -160,22 +211,25 @@ async def sync_modules() -> dict:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_module_caches()
 
 
 @router.post("/modules/reload")
-async def reload_modules() -> dict:
+async def reload_modules(loader: ModuleLoader = Depends(get_module_loader)) -> dict:
     """Reload all modules from disk without restarting.
 
     Clears the in-memory module cache and re-discovers modules
     from the modules directory. Use after updating module files
     on disk (via sync, manual edits, or PR merges).
     """
-    loader = ModuleLoader()
     try:
         result = await loader.reload_all()
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_module_caches()
 
 
 @router.post("/jobs")
@@ -189,24 +243,26 @@ async def create_job(request: JobCreateRequest) -> dict:
             settings=request.settings,
             max_duration=request.max_duration,
         )
+        _invalidate_job_caches()
         return {"id": job_id, "status": "pending"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/jobs")
-async def list_jobs(status: Optional[str] = None) -> dict:
+async def list_jobs(
+    status: Optional[str] = None,
+    state: StateManager = Depends(get_state_manager),
+) -> dict:
     """List jobs, optionally filtered by status."""
-    state = StateManager()
-    jobs = await state.list_jobs(status=status)
+    jobs = await _jobs_cache.get(status, lambda: state.list_jobs(status=status))
     return {"jobs": jobs}
 
 
 @router.get("/jobs/{job_id}")
-async def get_job(job_id: str) -> dict:
+async def get_job(job_id: str, state: StateManager = Depends(get_state_manager)) -> dict:
     """Get job details."""
-    state = StateManager()
-    job = await state.get_job(job_id)
+    job = await _job_cache.get(job_id, lambda: state.get_job(job_id))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -217,29 +273,76 @@ async def stop_job(job_id: str) -> dict:
     """Stop a running job."""
     scheduler = get_scheduler()
     success = await scheduler.stop_job(job_id)
+    _invalidate_job_caches()
     if not success:
         raise HTTPException(status_code=404, detail="Job not found or not running")
     return {"status": "stopped", "job_id": job_id}
 
 
 @router.get("/jobs/{job_id}/logs")
-async def get_logs(job_id: str, limit: int = 100) -> dict:
+async def get_logs(
+    job_id: str,
+    limit: int = 100,
+    state: StateManager = Depends(get_state_manager),
+) -> ORJSONResponse:
     """Get logs for a job."""
-    state = StateManager()
     job = await state.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
     logs = await state.get_logs(job_id, limit=limit)
-    return {"logs": logs}
+    return ORJSONResponse({"logs": logs})
+
+
+def _join_json_arrays(parts: list[bytes]) -> bytes:
+    """Merge encoded non-empty JSON arrays into one array without decoding them."""
+    if len(parts) == 1:
+        return parts[0]
+    return b"[" + b",".join(part[1:-1] for part in parts) + b"]"
+
+
+async def _ping_while_idle(
+    websocket: WebSocket,
+    queue: LogQueue,
+    last_sent: list[float],
+) -> None:
+    """Send a ping whenever a log stream has been idle for PING_INTERVAL.
+
+    Runs beside the streaming loop so the hot path is a plain queue.get()
+    rather than a wait_for() per frame. `last_sent[0]` is the loop time of
+    the last frame sent; the streaming loop updates it. If the ping fails,
+    a None sentinel is queued to wake the streaming loop so it can shut down.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            idle_until = last_sent[0] + PING_INTERVAL
+            if loop.time() < idle_until:
+                await asyncio.sleep(idle_until - loop.time())
+                continue
+            await websocket.send_bytes(_PING)
+            last_sent[0] = loop.time()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        queue.publish(None)
 
 
 @router.websocket("/jobs/{job_id}/logs/stream")
-async def stream_logs(websocket: WebSocket, job_id: str) -> None:
-    """Stream logs for a job via WebSocket."""
+async def stream_logs(
+    websocket: WebSocket,
+    job_id: str,
+    state: StateManager = Depends(get_state_manager),
+) -> None:
+    """Stream logs for a job via WebSocket.
+
+    Log entries are sent as UTF-8 JSON arrays in binary frames; each frame
+    carries every entry that was queued when the frame was built. If the
+    client falls behind and entries are dropped, a ``{"type": "dropped"}``
+    marker with the count precedes the next frame.
+    """
     await websocket.accept()
 
-    state = StateManager()
     job = await state.get_job(job_id)
     if not job:
         await websocket.close(code=4004, reason="Job not found")
@@ -247,70 +350,122 @@ async def stream_logs(websocket: WebSocket, job_id: str) -> None:
 
     scheduler = get_scheduler()
     queue = scheduler.subscribe_logs(job["id"])
+    loop = asyncio.get_running_loop()
+    last_sent = [loop.time()]
+    pinger = asyncio.create_task(_ping_while_idle(websocket, queue, last_sent))
 
     try:
         while True:
-            try:
-                log_entry = await asyncio.wait_for(queue.get(), timeout=30.0)
-                await websocket.send_json(log_entry)
-            except asyncio.TimeoutError:
-                await websocket.send_json({"type": "ping"})
+            batch = await queue.get()
+            if batch is None:
+                break
+
+            # Drain whatever else is already queued so bursts go out as one frame.
+            count, payload = batch
+            parts = [payload]
+            closing = False
+            while count < LOG_BATCH_SIZE:
+                try:
+                    more = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if more is None:
+                    closing = True
+                    break
+                count += more[0]
+                parts.append(more[1])
+
+            dropped = queue.take_dropped()
+            if dropped:
+                await websocket.send_bytes(orjson.dumps({"type": "dropped", "n": dropped}))
+            await websocket.send_bytes(_join_json_arrays(parts))
+            last_sent[0] = loop.time()
+            if closing:
+                break
     except WebSocketDisconnect:
         pass
     finally:
+        pinger.cancel()
         scheduler.unsubscribe_logs(job["id"], queue)
 
 
 @router.get("/jobs/{job_id}/results")
-async def get_results(job_id: str, limit: int = 1000) -> dict:
+async def get_results(
+    job_id: str,
+    limit: int = 1000,
+    state: StateManager = Depends(get_state_manager),
+) -> ORJSONResponse:
     """Get results for a job."""
-    state = StateManager()
     job = await state.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    results = await state.get_results(job_id, limit=limit)
-    count = await state.get_result_count(job_id)
-    return {"results": results, "total": count}
+    results, total = await state.get_results_with_count(job_id, limit=limit)
+    return ORJSONResponse({"results": results, "total": total})
 
 
-@router.post("/proxy-fetch", response_model=ProxyFetchResponse)
-async def proxy_fetch(request: ProxyFetchRequest) -> ProxyFetchResponse:
+@router.post(
+    "/proxy-fetch",
+    response_model=ProxyFetchResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": ProxyFetchRequest.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
+async def proxy_fetch(request: Request) -> ORJSONResponse:
     """Forward HTTP request through Bright Data proxy.
 
-    Used by WordPress to proxy requests through the VPS.
+    Used by WordPress to proxy requests through the VPS. The request body is
+    validated straight from the raw bytes, and the upstream body and headers
+    are serialized straight to the JSON payload instead of being wrapped in
+    (and re-validated through) a ProxyFetchResponse model.
     """
     try:
-        response = await proxied_request(
-            method=request.method.upper(),
-            url=request.url,
-            headers=request.headers if request.headers else None,
-            data=request.body.encode() if request.body else None,
-            timeout=float(request.timeout) if request.timeout else 60.0,
-            browser_mode=request.browser_mode,
-            session_id=request.session_id,
-            geo=request.geo,
+        fetch = ProxyFetchRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
         )
-        return ProxyFetchResponse(
-            success=True,
-            content=response.text,
-            status_code=response.status_code,
-            headers=dict(response.headers),
+
+    try:
+        response = await proxied_request(
+            method=fetch.method.upper(),
+            url=fetch.url,
+            headers=fetch.headers or None,
+            data=fetch.body.encode() if fetch.body else None,
+            timeout=float(fetch.timeout) if fetch.timeout else 60.0,
+            browser_mode=fetch.browser_mode,
+            session_id=fetch.session_id,
         )
+        payload = {
+            "success": True,
+            "content": response.text,
+            "status_code": response.status_code,
+            "headers": dict(response.headers.items()),
+            "error": None,
+        }
     except Exception as e:
-        return ProxyFetchResponse(
-            success=False,
-            error=str(e),
-        )
+        payload = {
+            "success": False,
+            "content": "",
+            "status_code": 0,
+            "headers": {},
+            "error": str(e),
+        }
+    return ORJSONResponse(payload)
 
 
 @router.post("/callbacks")
-async def receive_callback(request: CallbackRequest) -> dict:
+async def receive_callback(
+    request: CallbackRequest,
+    state: StateManager = Depends(get_state_manager),
+) -> dict:
     """Receive a callback from an external source.
 
     Used for orchestration - agents can POST results back after completing tasks.
     """
-    state = StateManager()
     cb_id = await state.save_callback(
         callback_id=request.callback_id,
         source=request.source,
@@ -325,9 +480,9 @@ async def list_callbacks(
     source: Optional[str] = None,
     callback_id: Optional[str] = None,
     limit: int = 100,
+    state: StateManager = Depends(get_state_manager),
 ) -> dict:
     """List callbacks, optionally filtered by source or callback_id."""
-    state = StateManager()
     callbacks = await state.list_callbacks(
         source=source,
         callback_id=callback_id,
@@ -337,9 +492,8 @@ async def list_callbacks(
 
 
 @router.get("/callbacks/{cb_id}")
-async def get_callback(cb_id: str) -> dict:
+async def get_callback(cb_id: str, state: StateManager = Depends(get_state_manager)) -> dict:
     """Get a specific callback by ID."""
-    state = StateManager()
     callback = await state.get_callback(cb_id)
     if not callback:
         raise HTTPException(status_code=404, detail="Callback not found")
@@ -347,9 +501,8 @@ async def get_callback(cb_id: str) -> dict:
 
 
 @router.delete("/callbacks/{cb_id}")
-async def delete_callback(cb_id: str) -> dict:
+async def delete_callback(cb_id: str, state: StateManager = Depends(get_state_manager)) -> dict:
     """Delete a callback by ID."""
-    state = StateManager()
     success = await state.delete_callback(cb_id)
     if not success:
         raise HTTPException(status_code=404, detail="Callback not found")
@@ -1,13 +1,23 @@
-"""Scheduler singleton for API access."""
+"""Engine singletons for API access."""
 
-from sweatpants.engine.job_scheduler import JobScheduler
+import functools
 
-_scheduler: JobScheduler | None = None
+from sweatpants.engine.job_scheduler import JobScheduler
+from sweatpants.engine.module_loader import ModuleLoader
+from sweatpants.engine.state import StateManager
 
 
+@functools.cache
 def get_scheduler() -> JobScheduler:
     """Get the global scheduler instance."""
-    global _scheduler
-    if _scheduler is None:
-        _scheduler = JobScheduler()
-    return _scheduler
+    return JobScheduler()
+
+
+def get_state_manager() -> StateManager:
+    """Get the state manager shared with the global scheduler."""
+    return get_scheduler().state
+
+
+def get_module_loader() -> ModuleLoader:
+    """Get the module loader shared with the global scheduler."""
+    return get_scheduler().module_loader
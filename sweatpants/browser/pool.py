@@ -1,30 +1,44 @@
 """Browser pool management with Playwright."""
 
 import asyncio
-import uuid
+import secrets
+import time
+from collections import deque
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
 from typing import Any, AsyncIterator, Optional
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+from playwright.async_api import Error as PlaywrightError
 
 from sweatpants.config import get_settings
-from sweatpants.proxy.client import build_proxy_url
+from sweatpants.proxy.client import DEFAULT_USER_AGENT, build_proxy_url
+
+_DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+
+# Options applied to every pooled browser context.
+_CONTEXT_OPTIONS: dict[str, Any] = {
+    "viewport": _DEFAULT_VIEWPORT,
+    "user_agent": DEFAULT_USER_AGENT,
+}
 
 
 class BrowserInstance:
     """A managed browser instance with lifecycle tracking."""
 
-    def __init__(self, browser: Browser, created_at: datetime) -> None:
+    __slots__ = ("browser", "context", "use_count", "_started")
+
+    def __init__(self, browser: Browser, context: BrowserContext) -> None:
         self.browser = browser
-        self.created_at = created_at
+        self.context = context
         self.use_count = 0
+        # Age is measured on the monotonic clock so wall-clock jumps can't
+        # trigger (or postpone) restarts.
+        self._started = time.monotonic()
 
     @property
     def age_hours(self) -> float:
         """Get age of browser instance in hours."""
-        delta = datetime.now(timezone.utc) - self.created_at
-        return delta.total_seconds() / 3600
+        return (time.monotonic() - self._started) / 3600
 
     def should_restart(self, max_hours: int) -> bool:
         """Check if browser should be restarted."""
@@ -39,8 +53,12 @@ class BrowserPool:
         self._geo = geo
         self._use_proxy = use_proxy
         self._playwright: Optional[Playwright] = None
-        self._browsers: list[BrowserInstance] = []
-        self._available: asyncio.Queue[BrowserInstance] = asyncio.Queue()
+        # Fixed slot table: _slots[i] is the browser in slot i, _free holds the
+        # free slot numbers in release order, and _sem counts them (FIFO wake-up).
+        self._slots: list[BrowserInstance] = []
+        self._ctx_slot: dict[BrowserContext, int] = {}
+        self._free: deque[int] = deque()
+        self._sem = asyncio.Semaphore(0)
         self._lock = asyncio.Lock()
         self._initialized = False
 
@@ -55,10 +73,27 @@ class BrowserPool:
 
             self._playwright = await async_playwright().start()
 
-            for _ in range(self.settings.browser_pool_size):
-                instance = await self._create_browser()
-                self._browsers.append(instance)
-                await self._available.put(instance)
+            # Launch all browsers at once; if any launch fails, close the ones
+            # that did start so a failed start() leaves nothing running.
+            launched = await asyncio.gather(
+                *(self._create_browser() for _ in range(self.settings.browser_pool_size)),
+                return_exceptions=True,
+            )
+            instances = [i for i in launched if isinstance(i, BrowserInstance)]
+            errors = [e for e in launched if isinstance(e, BaseException)]
+            if errors:
+                await asyncio.gather(
+                    *(i.browser.close() for i in instances), return_exceptions=True
+                )
+                await self._playwright.stop()
+                self._playwright = None
+                raise errors[0]
+
+            self._slots = instances
+            self._ctx_slot = {instance.context: slot for slot, instance in enumerate(instances)}
+            self._free.extend(range(len(instances)))
+            for _ in instances:
+                self._sem.release()
 
             self._initialized = True
 
@@ -70,70 +105,103 @@ class BrowserPool:
         launch_kwargs: dict[str, Any] = {"headless": True}
 
         if self._use_proxy:
-            browser_session = f"browser-{uuid.uuid4()}"
+            browser_session = f"browser-{secrets.token_hex(8)}"
             proxy_url = build_proxy_url(session_id=browser_session)
             launch_kwargs["proxy"] = {"server": proxy_url}
 
         browser = await self._playwright.chromium.launch(**launch_kwargs)
-        return BrowserInstance(
-            browser=browser,
-            created_at=datetime.now(timezone.utc),
-        )
+        context = await browser.new_context(**_CONTEXT_OPTIONS)
+        return BrowserInstance(browser=browser, context=context)
 
     async def acquire(self) -> BrowserContext:
         """Acquire a browser context from the pool."""
         if not self._initialized:
             await self.start()
 
-        instance = await self._available.get()
-        instance.use_count += 1
+        await self._sem.acquire()
+        # Take the slot that has been idle longest, spreading use across browsers.
+        slot = self._free.popleft()
 
-        if instance.should_restart(self.settings.browser_restart_hours):
-            await instance.browser.close()
-            new_instance = await self._create_browser()
+        try:
+            instance = self._slots[slot]
+            instance.use_count += 1
 
-            idx = self._browsers.index(instance)
-            self._browsers[idx] = new_instance
-            instance = new_instance
+            if not instance.browser.is_connected() or instance.should_restart(
+                self.settings.browser_restart_hours
+            ):
+                await instance.browser.close()
+                new_instance = await self._create_browser()
 
-        context = await instance.browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-        )
+                del self._ctx_slot[instance.context]
+                self._slots[slot] = new_instance
+                self._ctx_slot[new_instance.context] = slot
+                instance = new_instance
+        except BaseException:
+            self._free_slot(slot)
+            raise
 
-        return context
+        return instance.context
 
-    async def release(self, context: BrowserContext) -> None:
-        """Release a browser context back to the pool."""
-        await context.close()
+    def _free_slot(self, slot: int) -> None:
+        """Mark a slot free and wake the next waiting acquirer."""
+        self._free.append(slot)
+        self._sem.release()
 
-        for instance in self._browsers:
-            if not instance.browser.is_connected():
-                continue
+    async def release(self, context: BrowserContext) -> None:
+        """Release a browser context back to the pool.
+
+        The context is closed and its browser given a fresh one, so the next
+        caller inherits none of this caller's state (routes, init scripts,
+        bindings, storage). The browser itself stays running.
+        """
+        slot = self._ctx_slot.get(context)
+        if slot is None:
+            await context.close()
+            return
 
-            contexts = instance.browser.contexts
-            if len(contexts) == 0 or all(c != context for c in contexts):
-                await self._available.put(instance)
-                break
+        try:
+            await self._replace_context(slot)
+        finally:
+            self._free_slot(slot)
+
+    async def _replace_context(self, slot: int) -> None:
+        """Close a slot's context and give its browser a new one."""
+        instance = self._slots[slot]
+        del self._ctx_slot[instance.context]
+        try:
+            await instance.context.close()
+        except PlaywrightError:
+            # Already closed by the caller, or the browser died under it.
+            pass
+        try:
+            instance.context = await instance.browser.new_context(**_CONTEXT_OPTIONS)
+        except PlaywrightError:
+            # Closing the browser makes the next acquire() restart it.
+            try:
+                await instance.browser.close()
+            except PlaywrightError:
+                pass
+        self._ctx_slot[instance.context] = slot
 
     async def stop(self) -> None:
         """Shut down the browser pool."""
         async with self._lock:
-            for instance in self._browsers:
-                try:
-                    await instance.browser.close()
-                except Exception:
-                    pass
+            # Close every browser at once; failures are ignored during shutdown.
+            await asyncio.gather(
+                *(instance.browser.close() for instance in self._slots),
+                return_exceptions=True,
+            )
 
             if self._playwright:
                 await self._playwright.stop()
                 self._playwright = None
 
-            self._browsers.clear()
+            self._slots.clear()
+            self._ctx_slot.clear()
+            self._free.clear()
+            # Take back the free-slot permits; waiters keep waiting for a restart.
+            while not self._sem.locked():
+                await self._sem.acquire()
             self._initialized = False
 
 
@@ -141,11 +209,16 @@ _pools: dict[tuple[Optional[str], bool], BrowserPool] = {}
 
 
 def _get_pool(geo: Optional[str] = None, use_proxy: bool = True) -> BrowserPool:
-    """Get browser pool for the given geo-target and proxy setting."""
+    """Get browser pool for the given geo-target and proxy setting.
+
+    Synchronous on purpose: with no await between the lookup and the insert,
+    concurrent callers on the event loop can never create duplicate pools.
+    """
     key = (geo, use_proxy)
-    if key not in _pools:
-        _pools[key] = BrowserPool(geo=geo, use_proxy=use_proxy)
-    return _pools[key]
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = BrowserPool(geo=geo, use_proxy=use_proxy)
+    return pool
 
 
 @asynccontextmanager
@@ -181,8 +254,19 @@ async def get_browser(
         await pool.release(context)
 
 
+async def prewarm_pool(geo: Optional[str] = None, use_proxy: bool = True) -> None:
+    """Start a browser pool ahead of its first use.
+
+    Launches Playwright and the pool's browsers now so the first
+    get_browser() call doesn't pay for it.
+    """
+    await _get_pool(geo=geo, use_proxy=use_proxy).start()
+
+
 async def shutdown_pool() -> None:
     """Shut down all browser pools."""
-    for pool in _pools.values():
-        await pool.stop()
+    # Detach the registry before awaiting so a get_browser() call made while
+    # we shut down gets a fresh pool instead of mutating the dict mid-loop.
+    pools = list(_pools.values())
     _pools.clear()
+    await asyncio.gather(*(pool.stop() for pool in pools))
@@ -1,16 +1,19 @@
 """Command-line interface for Sweatpants."""
 
 import asyncio
-import json
+import atexit
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
 from sweatpants.config import get_settings
 
+if TYPE_CHECKING:
+    import httpx
+
 app = typer.Typer(
     name="sweatpants",
     help="Server-side automation engine for long-running tasks.",
@@ -22,9 +25,28 @@ app.add_typer(module_app, name="module")
 console = Console()
 
 
+@functools.cache
+def _base_url(scheme: str = "http") -> str:
+    """Get the daemon's base URL for the given scheme."""
+    settings = get_settings()
+    return f"{scheme}://{settings.api_host}:{settings.api_port}"
+
+
+@functools.cache
+def _client() -> "httpx.Client":
+    """Get the HTTP client for talking to the daemon, shared by all commands."""
+    import httpx
+
+    client = httpx.Client(base_url=_base_url())
+    atexit.register(client.close)
+    return client
+
+
 @app.command()
 def config() -> None:
     """Show effective configuration values."""
+    from rich.table import Table
+
     settings = get_settings()
 
     table = Table(title="Sweatpants Config")
@@ -65,20 +87,31 @@ def serve(
 
     console.print(f"[green]Starting Sweatpants on {api_host}:{api_port}[/green]")
 
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
     app_instance = create_app()
-    uvicorn.run(app_instance, host=api_host, port=api_port, log_level=settings.log_level.lower())
+    uvicorn.run(
+        app_instance,
+        host=api_host,
+        port=api_port,
+        log_level=settings.log_level.lower(),
+        loop=loop,
+    )
 
 
 @app.command()
 def status() -> None:
     """Show engine status and running jobs."""
     import httpx
-
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
+    from rich.table import Table
 
     try:
-        response = httpx.get(f"{url}/status", timeout=5.0)
+        response = _client().get("/status", timeout=5.0)
         response.raise_for_status()
         data = response.json()
 
@@ -127,9 +160,6 @@ def run(
     """Start a job with the specified module."""
     import httpx
 
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
-
     input_data = {}
     if inputs:
         for item in inputs:
@@ -149,8 +179,8 @@ def run(
         request_body["max_duration"] = duration
 
     try:
-        response = httpx.post(
-            f"{url}/jobs",
+        response = _client().post(
+            "/jobs",
             json=request_body,
             timeout=10.0,
         )
@@ -177,11 +207,8 @@ def stop(job_id: str = typer.Argument(..., help="Job ID to stop")) -> None:
     """Stop a running job."""
     import httpx
 
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
-
     try:
-        response = httpx.post(f"{url}/jobs/{job_id}/stop", timeout=10.0)
+        response = _client().post(f"/jobs/{job_id}/stop", timeout=10.0)
         response.raise_for_status()
 
         console.print(f"[green]Job {job_id[:8]} stopped.[/green]")
@@ -201,17 +228,15 @@ def result(
 ) -> None:
     """Get results/output for a job."""
     import httpx
-
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
+    import orjson
 
     try:
-        response = httpx.get(f"{url}/jobs/{job_id}/results", timeout=10.0)
+        response = _client().get(f"/jobs/{job_id}/results", timeout=10.0)
         response.raise_for_status()
         data = response.json()
 
         if raw:
-            console.print(json.dumps(data, indent=2))
+            console.print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
             return
 
         results = data.get("results", [])
@@ -226,7 +251,7 @@ def result(
             console.print(f"[cyan]--- Result {i} ---[/cyan]")
             result_data = result_item.get("data", {})
             if isinstance(result_data, dict):
-                console.print(json.dumps(result_data, indent=2))
+                console.print(orjson.dumps(result_data, option=orjson.OPT_INDENT_2).decode())
             else:
                 console.print(str(result_data))
             console.print()
@@ -239,6 +264,15 @@ def result(
         raise typer.Exit(1)
 
 
+_LEVEL_COLORS = {"INFO": "white", "WARNING": "yellow", "ERROR": "red"}
+
+
+def _format_log_line(timestamp: str, level: str, message: str) -> str:
+    """Format a log entry as a rich markup line."""
+    color = _LEVEL_COLORS.get(level, "white")
+    return f"[dim]{timestamp}[/dim] [{color}]{level}[/{color}] {message}"
+
+
 @app.command()
 def logs(
     job_id: str = typer.Argument(..., help="Job ID to view logs"),
@@ -246,48 +280,50 @@ def logs(
 ) -> None:
     """View logs for a job."""
     import httpx
-
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
+    import orjson
 
     try:
-        response = httpx.get(f"{url}/jobs/{job_id}/logs", timeout=10.0)
+        response = _client().get(f"/jobs/{job_id}/logs", timeout=10.0)
         response.raise_for_status()
         data = response.json()
 
-        for entry in data["logs"]:
-            timestamp = entry["timestamp"]
-            level = entry["level"]
-            message = entry["message"]
-
-            color = {"INFO": "white", "WARNING": "yellow", "ERROR": "red"}.get(level, "white")
-            console.print(f"[dim]{timestamp}[/dim] [{color}]{level}[/{color}] {message}")
+        lines = [
+            _format_log_line(entry["timestamp"], entry["level"], entry["message"])
+            for entry in data["logs"]
+        ]
+        if lines:
+            console.print("\n".join(lines))
 
         if follow:
             console.print("[dim]Following logs... (Ctrl+C to exit)[/dim]")
             import websockets.sync.client as ws_client
 
-            ws_url = f"ws://{settings.api_host}:{settings.api_port}/jobs/{job_id}/logs/stream"
+            ws_url = f"{_base_url('ws')}/jobs/{job_id}/logs/stream"
             with ws_client.connect(ws_url) as websocket:
                 for message in websocket:
-                    entry = json.loads(message)
-
-                    # Server sends keepalive pings.
-                    if entry.get("type") == "ping":
-                        continue
-
-                    timestamp = entry.get("timestamp", "")
-                    level = entry.get("level", "INFO")
-                    msg = entry.get("message", "")
-
-                    if not msg:
-                        # Avoid crashing on unexpected payloads.
+                    payload = orjson.loads(message)
+
+                    # Log entries arrive in batches; pings and markers arrive as objects.
+                    if not isinstance(payload, list):
+                        if payload.get("type") == "dropped":
+                            console.print(
+                                f"[yellow]... {payload.get('n', 0)} log entries dropped[/yellow]"
+                            )
                         continue
 
-                    color = {"INFO": "white", "WARNING": "yellow", "ERROR": "red"}.get(
-                        level, "white"
-                    )
-                    console.print(f"[dim]{timestamp}[/dim] [{color}]{level}[/{color}] {msg}")
+                    # Render each frame with a single print rather than one per entry.
+                    lines = [
+                        _format_log_line(
+                            entry.get("timestamp", ""),
+                            entry.get("level", "INFO"),
+                            entry["message"],
+                        )
+                        for entry in payload
+                        # Skip unexpected payloads instead of crashing.
+                        if entry.get("message")
+                    ]
+                    if lines:
+                        console.print("\n".join(lines))
 
     except httpx.ConnectError:
         console.print("[red]Error: Cannot connect to Sweatpants daemon.[/red]")
@@ -298,12 +334,10 @@ def logs(
 def module_list() -> None:
     """List installed modules."""
     import httpx
-
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
+    from rich.table import Table
 
     try:
-        response = httpx.get(f"{url}/modules", timeout=10.0)
+        response = _client().get("/modules", timeout=10.0)
         response.raise_for_status()
         data = response.json()
 
@@ -335,6 +369,8 @@ def module_list() -> None:
 @module_app.command("install")
 def module_install(path: Path = typer.Argument(..., help="Path to module directory")) -> None:
     """Install a module from a directory."""
+    import json
+
     import httpx
 
     if not path.exists():
@@ -349,12 +385,9 @@ def module_install(path: Path = typer.Argument(..., help="Path to module directo
     with open(module_json) as f:
         module_data = json.load(f)
 
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
-
     try:
-        response = httpx.post(
-            f"{url}/modules/install",
+        response = _client().post(
+            "/modules/install",
             json={"source_path": str(path.resolve())},
             timeout=60.0,
         )
@@ -377,11 +410,8 @@ def module_uninstall(module_id: str = typer.Argument(..., help="Module ID to uni
     """Uninstall a module."""
     import httpx
 
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
-
     try:
-        response = httpx.delete(f"{url}/modules/{module_id}", timeout=10.0)
+        response = _client().delete(f"/modules/{module_id}", timeout=10.0)
         response.raise_for_status()
 
         console.print(f"[green]Module uninstalled:[/green] {module_id}")
@@ -404,9 +434,6 @@ def module_install_git(
     """Install a module from a git repository."""
     import httpx
 
-    settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
-
     console.print(f"[dim]Cloning from {repo_url}...[/dim]")
 
     request_body = {"repo_url": repo_url}
@@ -414,8 +441,8 @@ def module_install_git(
         request_body["module_name"] = module_name
 
     try:
-        response = httpx.post(
-            f"{url}/modules/install-git",
+        response = _client().post(
+            "/modules/install-git",
             json=request_body,
             timeout=180.0,  # Git clone can take a while
         )
@@ -447,15 +474,15 @@ def module_sync() -> None:
             modules: [diagram-generator, chart-generator]
     """
     import httpx
+    from rich.table import Table
 
     settings = get_settings()
-    url = f"http://{settings.api_host}:{settings.api_port}"
 
     console.print(f"[dim]Syncing modules from {settings.modules_config_path}...[/dim]")
 
     try:
-        response = httpx.post(
-            f"{url}/modules/sync",
+        response = _client().post(
+            "/modules/sync",
             timeout=300.0,  # Multiple git clones can take a while
         )
         response.raise_for_status()
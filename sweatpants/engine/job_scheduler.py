@@ -1,13 +1,62 @@
 """Async job scheduler for running module tasks."""
 
 import asyncio
+import functools
+import heapq
+import itertools
+import time
 import traceback
-from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 
+import orjson
+
 from sweatpants.engine.module_loader import ModuleLoader
 from sweatpants.engine.state import StateManager
-from sweatpants.utils import parse_duration
+from sweatpants.utils import BatchWriter, parse_duration, utc_timestamp
+
+# Results are written in batches: once this many are pending, or this many
+# seconds after the first of a batch was saved, whichever comes first.
+RESULT_BATCH_SIZE = 64
+RESULT_FLUSH_INTERVAL = 0.1
+
+# Innermost stack frames kept in the traceback logged for a failed job.
+TRACEBACK_LIMIT = 20
+
+
+class LogQueue(asyncio.Queue):
+    """Bounded queue of log batches for one stream subscriber.
+
+    Each item is an ``(entry_count, payload)`` pair, where payload is the
+    batch already encoded as a JSON array, or None, which tells the reader
+    to stop. When a subscriber falls behind, the oldest batches are
+    discarded so the newest ones still get through; the number of entries
+    discarded since the last check is tracked in ``dropped``, and over the
+    queue's lifetime in ``dropped_total``.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        super().__init__(maxsize=maxsize)
+        self.dropped = 0
+        self.dropped_total = 0
+
+    def publish(self, batch: Optional[tuple[int, bytes]]) -> None:
+        """Enqueue a batch, dropping the oldest one if the queue is full."""
+        try:
+            self.put_nowait(batch)
+        except asyncio.QueueFull:
+            try:
+                oldest = self.get_nowait()
+            except asyncio.QueueEmpty:
+                oldest = None
+            lost = oldest[0] if oldest else 0
+            self.dropped += lost
+            self.dropped_total += lost
+            self.put_nowait(batch)
+
+    def take_dropped(self) -> int:
+        """Return and reset the number of entries dropped so far."""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
 
 
 class JobContext:
@@ -23,6 +72,9 @@ class JobContext:
         self._state = state
         self._log_callback = log_callback
         self._cancelled = False
+        self._results: BatchWriter[dict[str, Any]] = BatchWriter(
+            self._write_results, RESULT_BATCH_SIZE, RESULT_FLUSH_INTERVAL
+        )
 
     @property
     def is_cancelled(self) -> bool:
@@ -38,15 +90,34 @@ class JobContext:
             self._log_callback(self.job_id, level, message)
 
     async def save_result(self, data: dict[str, Any]) -> None:
-        """Save a result from this job."""
-        await self._state.add_result(self.job_id, data)
+        """Save a result from this job.
+
+        Results are written in batches; flush_results() writes any that are
+        still pending.
+        """
+        await self._results.add(data)
+
+    async def _write_results(self, batch: list[dict[str, Any]]) -> None:
+        """Insert a batch of results."""
+        await self._state.add_results(self.job_id, batch)
+
+    async def flush_results(self) -> None:
+        """Write all pending results to the database."""
+        await self._results.flush()
 
     async def save_checkpoint(self, checkpoint: dict[str, Any]) -> None:
         """Save checkpoint state for resume capability."""
+        # A checkpoint must never get ahead of the results it covers.
+        await self.flush_results()
         await self._state.update_job_status(
             self.job_id, "running", checkpoint=checkpoint
         )
 
+    async def save_checkpoint_delta(self, data: dict[str, Any]) -> None:
+        """Update some keys of the saved checkpoint, leaving the rest as stored."""
+        await self.flush_results()
+        await self._state.merge_checkpoint(self.job_id, data)
+
 
 class JobScheduler:
     """Manages async job execution."""
@@ -56,51 +127,111 @@ class JobScheduler:
         self.module_loader = ModuleLoader()
         self._running_jobs: dict[str, asyncio.Task] = {}
         self._job_contexts: dict[str, JobContext] = {}
-        self._log_subscribers: dict[str, list[asyncio.Queue]] = {}
-        self._watchdogs: dict[str, asyncio.Task] = {}
-        self._started_at: datetime = datetime.now(timezone.utc)
+        self._log_subscribers: dict[str, set[LogQueue]] = {}
+        self._pending_logs: list[tuple[str, str, str]] = []
+        self._log_entries_dropped = 0  # By subscribers that have since left.
+        self._flush_scheduled = False
+        # Duration limits: a heap of [deadline, seq, job_id, context, limit]
+        # entries served by one watchdog task. When a job finishes first, its
+        # entry's context is set to None and the entry skipped when it comes
+        # up; the heap is rebuilt once such entries make up half of it.
+        self._deadlines: list[list[Any]] = []
+        self._deadline_entries: dict[str, list[Any]] = {}
+        self._dead_deadlines = 0
+        self._deadline_seq = itertools.count()
+        self._watchdog: Optional[asyncio.Task] = None
+        self._watchdog_wake: Optional[asyncio.Event] = None
+        self._started = time.monotonic()
+        self._uptime_cache: tuple[int, str] = (-1, "")
+        self._closed = False
 
     @property
     def uptime(self) -> str:
-        """Get human-readable uptime."""
-        delta = datetime.now(timezone.utc) - self._started_at
-        hours, remainder = divmod(int(delta.total_seconds()), 3600)
+        """Get human-readable uptime.
+
+        Measured on the monotonic clock; the string is rebuilt at most once
+        per second.
+        """
+        elapsed = int(time.monotonic() - self._started)
+        cached_at, text = self._uptime_cache
+        if elapsed == cached_at:
+            return text
+
+        hours, remainder = divmod(elapsed, 3600)
         minutes, seconds = divmod(remainder, 60)
         if hours > 0:
-            return f"{hours}h {minutes}m"
+            text = f"{hours}h {minutes}m"
         elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        return f"{seconds}s"
+            text = f"{minutes}m {seconds}s"
+        else:
+            text = f"{seconds}s"
+        self._uptime_cache = (elapsed, text)
+        return text
 
     def _broadcast_log(self, job_id: str, level: str, message: str) -> None:
-        """Broadcast log to subscribers."""
-        if job_id in self._log_subscribers:
-            log_entry = {
+        """Queue a log entry for delivery to the job's stream subscribers.
+
+        Entries are buffered and fanned out by _flush_logs on the next turn
+        of the event loop, so a burst of lines costs one queue operation
+        per subscriber rather than one per line.
+        """
+        if not self._log_subscribers.get(job_id):
+            return
+        self._pending_logs.append((job_id, level, message))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_logs)
+
+    def _flush_logs(self) -> None:
+        """Deliver buffered log entries to subscribers, one batch per job."""
+        self._flush_scheduled = False
+        pending, self._pending_logs = self._pending_logs, []
+
+        timestamp = utc_timestamp()
+        batches: dict[str, list[dict[str, Any]]] = {}
+        for job_id, level, message in pending:
+            batches.setdefault(job_id, []).append({
                 "level": level,
                 "message": message,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-            for queue in self._log_subscribers[job_id]:
-                try:
-                    queue.put_nowait(log_entry)
-                except asyncio.QueueFull:
-                    pass
-
-    def subscribe_logs(self, job_id: str) -> asyncio.Queue:
-        """Subscribe to log updates for a job."""
-        if job_id not in self._log_subscribers:
-            self._log_subscribers[job_id] = []
-        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
-        self._log_subscribers[job_id].append(queue)
+                "timestamp": timestamp,
+            })
+
+        # Encode each batch once; every subscriber gets the same bytes.
+        for job_id, batch in batches.items():
+            encoded = (len(batch), orjson.dumps(batch))
+            for queue in self._log_subscribers.get(job_id, ()):
+                queue.publish(encoded)
+
+    def subscribe_logs(self, job_id: str) -> LogQueue:
+        """Subscribe to log updates for a job.
+
+        The returned queue yields batches of log entries pre-encoded as
+        JSON arrays (see LogQueue). It is bounded and lossy: a subscriber
+        that falls behind loses its oldest pending batches rather than
+        growing without limit.
+        """
+        queue = LogQueue()
+        self._log_subscribers.setdefault(job_id, set()).add(queue)
         return queue
 
-    def unsubscribe_logs(self, job_id: str, queue: asyncio.Queue) -> None:
+    def unsubscribe_logs(self, job_id: str, queue: LogQueue) -> None:
         """Unsubscribe from log updates."""
-        if job_id in self._log_subscribers:
-            try:
-                self._log_subscribers[job_id].remove(queue)
-            except ValueError:
-                pass
+        subscribers = self._log_subscribers.get(job_id)
+        if not subscribers or queue not in subscribers:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._log_subscribers[job_id]
+        self._log_entries_dropped += queue.dropped_total
+
+    @property
+    def log_entries_dropped(self) -> int:
+        """Total log entries dropped from stream subscribers that fell behind."""
+        return self._log_entries_dropped + sum(
+            queue.dropped_total
+            for queues in self._log_subscribers.values()
+            for queue in queues
+        )
 
     async def start_job(
         self,
@@ -119,6 +250,9 @@ class JobScheduler:
             checkpoint: Optional checkpoint to resume from
             max_duration: Optional duration limit (e.g., '1h', '24h', '7d')
         """
+        if self._closed:
+            raise RuntimeError("Scheduler is shut down")
+
         module_info = await self.module_loader.get(module_id)
         if not module_info:
             raise ValueError(f"Module not found: {module_id}")
@@ -129,25 +263,7 @@ class JobScheduler:
             settings=settings or {},
         )
 
-        context = JobContext(
-            job_id=job_id,
-            state=self.state,
-            log_callback=self._broadcast_log,
-        )
-        self._job_contexts[job_id] = context
-
-        task = asyncio.create_task(
-            self._run_job(job_id, module_id, inputs, settings or {}, checkpoint, context)
-        )
-        self._running_jobs[job_id] = task
-
-        if max_duration:
-            timeout_seconds = parse_duration(max_duration)
-            watchdog = asyncio.create_task(
-                self._duration_watchdog(job_id, context, timeout_seconds, max_duration)
-            )
-            self._watchdogs[job_id] = watchdog
-
+        self._launch(job_id, module_id, inputs, settings or {}, checkpoint, max_duration)
         return job_id
 
     async def resume_job(
@@ -160,6 +276,21 @@ class JobScheduler:
         max_duration: Optional[str] = None,
     ) -> None:
         """Resume a previously running job."""
+        if self._closed:
+            raise RuntimeError("Scheduler is shut down")
+
+        self._launch(job_id, module_id, inputs, settings, checkpoint, max_duration)
+
+    def _launch(
+        self,
+        job_id: str,
+        module_id: str,
+        inputs: dict[str, Any],
+        settings: dict[str, Any],
+        checkpoint: Optional[dict[str, Any]],
+        max_duration: Optional[str],
+    ) -> None:
+        """Start the task that runs a job and register it as running."""
         context = JobContext(
             job_id=job_id,
             state=self.state,
@@ -171,28 +302,64 @@ class JobScheduler:
             self._run_job(job_id, module_id, inputs, settings, checkpoint, context)
         )
         self._running_jobs[job_id] = task
+        # Cleanup runs when the task is done however it ended, including a
+        # cancel that lands before _run_job gets to start.
+        task.add_done_callback(functools.partial(self._on_job_done, job_id))
 
         if max_duration:
-            timeout_seconds = parse_duration(max_duration)
-            watchdog = asyncio.create_task(
-                self._duration_watchdog(job_id, context, timeout_seconds, max_duration)
-            )
-            self._watchdogs[job_id] = watchdog
+            self._add_deadline(job_id, context, max_duration)
+
+    def _add_deadline(self, job_id: str, context: JobContext, max_duration: str) -> None:
+        """Schedule a job to be cancelled once its duration limit is reached."""
+        timeout_seconds = parse_duration(max_duration)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_seconds
+        entry = [deadline, next(self._deadline_seq), job_id, context, max_duration]
+        heapq.heappush(self._deadlines, entry)
+        self._deadline_entries[job_id] = entry
+
+        if (
+            self._watchdog is None
+            or self._watchdog.done()
+            or self._watchdog.get_loop() is not loop
+        ):
+            self._watchdog_wake = asyncio.Event()
+            self._watchdog = loop.create_task(self._duration_watchdog())
+        else:
+            # The new deadline may be earlier than the one being waited on.
+            self._watchdog_wake.set()
+
+    async def _duration_watchdog(self) -> None:
+        """Cancel jobs as their duration limits are reached."""
+        loop = asyncio.get_running_loop()
+        wake = self._watchdog_wake
+        while True:
+            wake.clear()
+            if not self._deadlines:
+                await wake.wait()
+                continue
+
+            deadline, _, job_id, context, duration_str = self._deadlines[0]
+            delay = deadline - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
 
-    async def _duration_watchdog(
-        self,
-        job_id: str,
-        context: JobContext,
-        timeout_seconds: int,
-        duration_str: str,
-    ) -> None:
-        """Cancel job after duration limit reached."""
-        try:
-            await asyncio.sleep(timeout_seconds)
+            heapq.heappop(self._deadlines)
+            if context is None:
+                self._dead_deadlines -= 1
+                continue  # Job already finished.
+            del self._deadline_entries[job_id]
             await context.log(f"Duration limit reached ({duration_str}) - stopping job")
             context.cancel()
-        except asyncio.CancelledError:
-            pass
+            # Cancel the task too, so a module blocked between results stops
+            # now rather than at its next yield.
+            task = self._running_jobs.get(job_id)
+            if task is not None:
+                task.cancel()
 
     async def _run_job(
         self,
@@ -217,35 +384,52 @@ class JobScheduler:
 
             async for result in module_instance.run(inputs, settings):
                 if context.is_cancelled:
+                    await context.flush_results()
                     await context.log("Job cancelled")
                     await self.state.update_job_status(job_id, "stopped")
                     return
 
                 await context.save_result(result)
 
+            await context.flush_results()
             await context.log("Job completed successfully")
             await self.state.update_job_status(job_id, "completed")
 
         except asyncio.CancelledError:
+            await context.flush_results()
             await context.log("Job cancelled")
             await self.state.update_job_status(job_id, "stopped")
         except Exception as e:
             error_msg = f"{type(e).__name__}: {str(e)}"
-            tb = traceback.format_exc()
+            tb = "".join(
+                traceback.TracebackException.from_exception(e, limit=-TRACEBACK_LIMIT).format()
+            )
+            await context.flush_results()
             await context.log(f"Job failed: {error_msg}\n{tb}", level="ERROR")
             await self.state.update_job_status(job_id, "failed", error=error_msg)
-        finally:
+
+    def _on_job_done(self, job_id: str, task: asyncio.Task) -> None:
+        """Clean up after a job's task finishes, unless it was superseded."""
+        if self._running_jobs.get(job_id) is task:
             self._cleanup_job(job_id)
 
     def _cleanup_job(self, job_id: str) -> None:
         """Clean up after job completion."""
-        if job_id in self._running_jobs:
-            del self._running_jobs[job_id]
-        if job_id in self._job_contexts:
-            del self._job_contexts[job_id]
-        if job_id in self._watchdogs:
-            self._watchdogs[job_id].cancel()
-            del self._watchdogs[job_id]
+        self._running_jobs.pop(job_id, None)
+        self._job_contexts.pop(job_id, None)
+        self._drop_deadline(job_id)
+
+    def _drop_deadline(self, job_id: str) -> None:
+        """Forget a finished job's duration limit so its context can be freed."""
+        entry = self._deadline_entries.pop(job_id, None)
+        if entry is None:
+            return
+        entry[3] = None
+        self._dead_deadlines += 1
+        if self._dead_deadlines * 2 > len(self._deadlines):
+            self._deadlines = [e for e in self._deadlines if e[3] is not None]
+            heapq.heapify(self._deadlines)
+            self._dead_deadlines = 0
 
     async def stop_job(self, job_id: str) -> bool:
         """Stop a running job."""
@@ -255,13 +439,15 @@ class JobScheduler:
 
         full_job_id = job["id"]
 
-        if full_job_id in self._job_contexts:
-            self._job_contexts[full_job_id].cancel()
+        context = self._job_contexts.get(full_job_id)
+        if context is not None:
+            context.cancel()
 
-        if full_job_id in self._running_jobs:
-            self._running_jobs[full_job_id].cancel()
+        task = self._running_jobs.get(full_job_id)
+        if task is not None:
+            task.cancel()
             try:
-                await self._running_jobs[full_job_id]
+                await task
             except asyncio.CancelledError:
                 pass
             return True
@@ -270,23 +456,26 @@ class JobScheduler:
 
     async def get_status(self) -> dict:
         """Get scheduler status."""
-        modules = await self.module_loader.list()
-        running_jobs = []
-
-        for job_id in self._running_jobs:
-            job = await self.state.get_job(job_id)
-            if job:
-                running_jobs.append({
-                    "id": job["id"],
-                    "module": job["module_id"],
-                    "status": job["status"],
-                    "started_at": job["started_at"],
-                })
+        modules, *jobs = await asyncio.gather(
+            self.module_loader.list(),
+            *(self.state.get_job(job_id) for job_id in list(self._running_jobs)),
+        )
+        running_jobs = [
+            {
+                "id": job["id"],
+                "module": job["module_id"],
+                "status": job["status"],
+                "started_at": job["started_at"],
+            }
+            for job in jobs
+            if job
+        ]
 
         return {
             "status": "running",
             "uptime": self.uptime,
             "module_count": len(modules),
+            "log_entries_dropped": self.log_entries_dropped,
             "jobs": running_jobs,
         }
 
@@ -306,3 +495,25 @@ class JobScheduler:
             count += 1
 
         return count
+
+    async def close(self, timeout: float = 30.0) -> None:
+        """Shut the scheduler down.
+
+        New jobs are refused from here on. Running jobs get up to `timeout`
+        seconds to finish; any still running after that are cancelled, which
+        records them as stopped. Call before the database is closed.
+        """
+        self._closed = True
+
+        tasks = list(self._running_jobs.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+
+        await self.state.flush()
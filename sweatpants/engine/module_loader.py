@@ -1,19 +1,31 @@
 """Module loader for installing and managing automation modules."""
 
+import asyncio
+import hashlib
 import importlib.util
-import json
-import re
+import os
 import shutil
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
 
 from sweatpants.config import get_settings
 from sweatpants.engine.state import StateManager
+from sweatpants.utils import AsyncTTLCache
+
+# URL prefixes accepted for git installs.
+_GIT_URL_PREFIXES = ("http://", "https://", "git@", "ssh://")
+
+# Directory under modules_dir holding one stamp file per module, written
+# after its requirements were installed; each holds the digest from
+# _requirements_digest() for that install. Kept outside the module
+# directories, which are replaced on every reinstall.
+_REQUIREMENTS_STAMPS = ".requirements"
 
 
 class ModuleInput(BaseModel):
@@ -48,6 +60,82 @@ class ModuleManifest(BaseModel):
     capabilities: list[str] = Field(default_factory=list)
 
 
+# Dump a manifest's inputs and settings in one pydantic-core call per list
+# instead of a model_dump() per item.
+_INPUT_LIST = TypeAdapter(list[ModuleInput])
+_SETTING_LIST = TypeAdapter(list[ModuleSetting])
+
+
+async def _run(*args: str, timeout: Optional[float] = None) -> str:
+    """Run a command as an asyncio subprocess and return its stdout.
+
+    Raises subprocess.CalledProcessError on a non-zero exit and
+    subprocess.TimeoutExpired if it runs past `timeout` seconds. The process
+    is killed if it times out or the caller is cancelled.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except BaseException as e:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        if isinstance(e, asyncio.TimeoutError):
+            raise subprocess.TimeoutExpired(list(args), timeout) from None
+        raise
+
+    out = stdout.decode(errors="replace")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(
+            proc.returncode, list(args), out, stderr.decode(errors="replace")
+        )
+    return out
+
+
+def _link_or_copy(src: str, dst: str) -> str:
+    """copytree() copy function: hard-link a file, copying it if that fails."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem, or one without hard links.
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _requirements_digest(requirements: Path) -> str:
+    """Fingerprint a requirements file together with the running environment."""
+    digest = hashlib.blake2b(requirements.read_bytes(), digest_size=16)
+    digest.update(sys.prefix.encode())
+    return digest.hexdigest()
+
+
+def _read_manifests(modules_dir: Path) -> list[tuple[Path, Any]]:
+    """Read module.json from every subdirectory of modules_dir that has one.
+
+    Returns (subdirectory, parsed manifest) pairs; when a manifest can't be
+    read, the exception takes the place of the manifest.
+    """
+    # scandir entries answer is_dir() from the directory listing, saving a
+    # stat() per entry on most filesystems.
+    with os.scandir(modules_dir) as entries:
+        subdirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+
+    manifests: list[tuple[Path, Any]] = []
+    for subdir in subdirs:
+        manifest_path = subdir / "module.json"
+        try:
+            manifests.append((subdir, orjson.loads(manifest_path.read_bytes())))
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            manifests.append((subdir, e))
+    return manifests
+
+
 class ModuleLoader:
     """Loads and manages automation modules."""
 
@@ -55,14 +143,115 @@ class ModuleLoader:
         self.settings = get_settings()
         self.state = StateManager()
         self._loaded_modules: dict[str, Any] = {}
+        # sys.modules keys this loader registered entrypoints under.
+        self._sys_module_keys: set[str] = set()
+        # Module records change only through this loader, which invalidates
+        # these on every install and uninstall; the TTL bounds staleness from
+        # anything else writing to the database.
+        self._module_cache = AsyncTTLCache(ttl=5.0, maxsize=256)
+        self._list_cache = AsyncTTLCache(ttl=5.0, maxsize=1)
+
+    def _invalidate_cache(self) -> None:
+        """Drop cached module records after the installed set changes."""
+        self._module_cache.clear()
+        self._list_cache.clear()
 
     def _get_module_path(self, module_id: str) -> Path:
         """Get the installation path for a module."""
         return self.settings.modules_dir / module_id
 
+    def _requirements_stamp(self, module_path: Path) -> Path:
+        """Get the path of a module's requirements stamp."""
+        return self.settings.modules_dir / _REQUIREMENTS_STAMPS / module_path.name
+
+    def _write_requirements_stamp(self, module_path: Path, digest: str) -> None:
+        """Record that a module's requirements were installed."""
+        stamp = self._requirements_stamp(module_path)
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(digest)
+
+    def _pending_requirements(self, module_path: Path) -> Optional[str]:
+        """Return the requirements digest if a module's requirements need installing.
+
+        None means the module has no requirements.txt, or the same file was
+        already installed into this environment.
+        """
+        requirements = module_path / "requirements.txt"
+        if not requirements.exists():
+            return None
+        digest = _requirements_digest(requirements)
+        stamp = self._requirements_stamp(module_path)
+        if stamp.exists() and stamp.read_text() == digest:
+            return None
+        return digest
+
+    async def _install_requirements(self, module_path: Path) -> None:
+        """Install a module's requirements.txt, if it has one, with pip."""
+        digest = self._pending_requirements(module_path)
+        if digest is None:
+            return
+        requirements = module_path / "requirements.txt"
+        await _run(sys.executable, "-m", "pip", "install", "-r", str(requirements), "-q")
+        self._write_requirements_stamp(module_path, digest)
+
+    async def _install_requirements_batch(self, module_paths: list[Path]) -> dict[Path, Exception]:
+        """Install the requirements of several modules with a single pip run.
+
+        Modules whose requirements are already installed are skipped. If the
+        combined run fails, each module is retried on its own so only the
+        modules whose requirements can't be installed are affected. Returns
+        the errors for those, keyed by module path.
+        """
+        pending = {
+            path: digest
+            for path in module_paths
+            if (digest := self._pending_requirements(path)) is not None
+        }
+        if not pending:
+            return {}
+
+        requirement_args = [
+            arg for path in pending for arg in ("-r", str(path / "requirements.txt"))
+        ]
+        try:
+            await _run(sys.executable, "-m", "pip", "install", *requirement_args, "-q")
+        except subprocess.CalledProcessError:
+            pass
+        else:
+            for path, digest in pending.items():
+                self._write_requirements_stamp(path, digest)
+            return {}
+
+        errors: dict[Path, Exception] = {}
+        for path in pending:
+            try:
+                await self._install_requirements(path)
+            except subprocess.CalledProcessError as e:
+                errors[path] = e
+        return errors
+
     async def install(self, source_path: str) -> ModuleManifest:
         """Install a module from a source directory."""
-        source = Path(source_path)
+        manifest, dest = await self._stage(Path(source_path))
+        await self._install_requirements(dest)
+        await self._register(manifest, dest)
+        return manifest
+
+    async def _stage(
+        self, source: Path, link: bool = False, claimed: Optional[set[str]] = None
+    ) -> tuple[ModuleManifest, Path]:
+        """Validate a module source and copy it into the modules directory.
+
+        Returns the manifest and the installed path. Requirements are not
+        installed and the module is not registered yet. With `link`, files
+        are hard-linked instead of copied where possible; only pass it for
+        sources that are discarded afterwards, since linked files share
+        their contents with the source.
+
+        Concurrent stagings pass a shared `claimed` set of module IDs: a
+        source whose ID was already claimed is rejected rather than copied
+        over the same directory at the same time.
+        """
         if not source.exists():
             raise FileNotFoundError(f"Source path does not exist: {source}")
 
@@ -70,67 +259,49 @@ class ModuleLoader:
         if not manifest_path.exists():
             raise FileNotFoundError(f"No module.json found in {source}")
 
-        with open(manifest_path) as f:
-            manifest_data = json.load(f)
+        manifest_data = orjson.loads(manifest_path.read_bytes())
 
-        manifest = ModuleManifest(**manifest_data)
+        manifest = ModuleManifest.model_validate(manifest_data)
+
+        # No await between the check and the add, so exactly one caller wins.
+        if claimed is not None:
+            if manifest.id in claimed:
+                raise ValueError(
+                    f"Duplicate module id '{manifest.id}': already installed from another source"
+                )
+            claimed.add(manifest.id)
 
         dest = self._get_module_path(manifest.id)
         # Skip copy if source is already at destination (e.g., module already in modules_dir)
         if source.resolve() == dest.resolve():
-            requirements = dest / "requirements.txt"
-            if requirements.exists():
-                subprocess.run(
-                    [
-                        sys.executable,
-                        "-m",
-                        "pip",
-                        "install",
-                        "-r",
-                        str(requirements),
-                        "-q",
-                    ],
-                    check=True,
-                    capture_output=True,
-                )
-            await self.state.save_module(
-                module_id=manifest.id,
-                name=manifest.name,
-                version=manifest.version,
-                description=manifest.description,
-                entrypoint=manifest.entrypoint,
-                inputs=[i.model_dump() for i in manifest.inputs],
-                settings=[s.model_dump() for s in manifest.settings],
-                capabilities=manifest.capabilities,
-                path=str(dest),
-            )
-            return manifest
+            return manifest, dest
+
+        # Filesystem work runs in a worker thread so installs don't stall the
+        # event loop (and every open log stream with it).
         if dest.exists():
-            shutil.rmtree(dest)
+            await asyncio.to_thread(shutil.rmtree, dest)
 
-        shutil.copytree(source, dest)
+        copy_function = _link_or_copy if link else shutil.copy2
+        await asyncio.to_thread(
+            shutil.copytree, source, dest, copy_function=copy_function
+        )
 
-        requirements = dest / "requirements.txt"
-        if requirements.exists():
-            subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", str(requirements), "-q"],
-                check=True,
-                capture_output=True,
-            )
+        return manifest, dest
 
+    async def _register(self, manifest: ModuleManifest, dest: Path) -> None:
+        """Record an installed module in the database."""
         await self.state.save_module(
             module_id=manifest.id,
             name=manifest.name,
             version=manifest.version,
             description=manifest.description,
             entrypoint=manifest.entrypoint,
-            inputs=[i.model_dump() for i in manifest.inputs],
-            settings=[s.model_dump() for s in manifest.settings],
+            inputs=_INPUT_LIST.dump_python(manifest.inputs),
+            settings=_SETTING_LIST.dump_python(manifest.settings),
             capabilities=manifest.capabilities,
             path=str(dest),
         )
-
-        return manifest
+        self._invalidate_cache()
 
     async def install_from_git(
         self, repo_url: str, module_name: Optional[str] = None
@@ -149,23 +320,45 @@ class ModuleLoader:
             ValueError: If the repo URL is invalid or git operations fail.
             FileNotFoundError: If module.json is not found.
         """
+        (outcome,) = await self._fetch_from_git(repo_url, [module_name])
+        if isinstance(outcome, Exception):
+            raise outcome
+        manifest, dest = outcome
+        await self._install_requirements(dest)
+        await self._register(manifest, dest)
+        return manifest
+
+    async def _fetch_from_git(
+        self,
+        repo_url: str,
+        module_names: list[Optional[str]],
+        claimed: Optional[set[str]] = None,
+    ) -> list[Union[tuple[ModuleManifest, Path], Exception]]:
+        """Clone a repository once and stage the given modules from it.
+
+        Returns one entry per module name (None for the repo root): its
+        manifest and installed path, or the exception that kept it from
+        being staged. Errors affecting the whole repository, such as an
+        invalid URL or a failed clone, are raised. Module IDs are claimed
+        in `claimed` (see _stage); pass a shared set when fetching several
+        repositories at once.
+        """
+        if claimed is None:
+            claimed = set()
+
         # Validate URL format (basic check for git-compatible URLs)
-        if not re.match(r"^(https?://|git@|ssh://)", repo_url):
+        if not repo_url.startswith(_GIT_URL_PREFIXES):
             raise ValueError(f"Invalid git repository URL: {repo_url}")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        # Created and removed by hand rather than with TemporaryDirectory, so
+        # removing a large checkout runs in a worker thread.
+        temp_path = Path(tempfile.mkdtemp())
+        try:
             clone_path = temp_path / "repo"
 
             # Clone the repository
             try:
-                result = subprocess.run(
-                    ["git", "clone", "--depth", "1", repo_url, str(clone_path)],
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    timeout=120,
-                )
+                await _run("git", "clone", "--depth", "1", repo_url, str(clone_path), timeout=120)
             except subprocess.CalledProcessError as e:
                 raise ValueError(f"Failed to clone repository: {e.stderr.strip()}")
             except subprocess.TimeoutExpired:
@@ -173,32 +366,43 @@ class ModuleLoader:
             except FileNotFoundError:
                 raise ValueError("Git is not installed or not in PATH")
 
-            # Determine the module source path
+            return await asyncio.gather(
+                *(self._stage_from_clone(clone_path, name, claimed) for name in module_names),
+                return_exceptions=True,
+            )
+        finally:
+            await asyncio.to_thread(shutil.rmtree, temp_path, ignore_errors=True)
+
+    async def _stage_from_clone(
+        self, clone_path: Path, module_name: Optional[str], claimed: set[str]
+    ) -> tuple[ModuleManifest, Path]:
+        """Stage one module from a cloned repository."""
+        # Determine the module source path
+        if module_name:
+            source_path = clone_path / module_name
+            if not source_path.exists():
+                raise FileNotFoundError(
+                    f"Module subdirectory not found: {module_name}"
+                )
+        else:
+            source_path = clone_path
+
+        # Verify module.json exists
+        manifest_path = source_path / "module.json"
+        if not manifest_path.exists():
             if module_name:
-                source_path = clone_path / module_name
-                if not source_path.exists():
-                    raise FileNotFoundError(
-                        f"Module subdirectory not found: {module_name}"
-                    )
+                raise FileNotFoundError(
+                    f"No module.json found in {module_name}. "
+                    "Ensure the subdirectory contains a valid module."
+                )
             else:
-                source_path = clone_path
-
-            # Verify module.json exists
-            manifest_path = source_path / "module.json"
-            if not manifest_path.exists():
-                if module_name:
-                    raise FileNotFoundError(
-                        f"No module.json found in {module_name}. "
-                        "Ensure the subdirectory contains a valid module."
-                    )
-                else:
-                    raise FileNotFoundError(
-                        "No module.json found in repository root. "
-                        "If the module is in a subdirectory, specify the module_name."
-                    )
+                raise FileNotFoundError(
+                    "No module.json found in repository root. "
+                    "If the module is in a subdirectory, specify the module_name."
+                )
 
-            # Use existing install method to complete the installation
-            return await self.install(str(source_path))
+        # The clone is deleted once staging is done, so its files can be linked.
+        return await self._stage(source_path, link=True, claimed=claimed)
 
     async def uninstall(self, module_id: str) -> bool:
         """Uninstall a module."""
@@ -208,28 +412,45 @@ class ModuleLoader:
 
         module_path = self._get_module_path(module_id)
         if module_path.exists():
-            shutil.rmtree(module_path)
+            await asyncio.to_thread(shutil.rmtree, module_path)
+        self._requirements_stamp(module_path).unlink(missing_ok=True)
 
-        if module_id in self._loaded_modules:
-            del self._loaded_modules[module_id]
+        self._loaded_modules.pop(module_id, None)
+        if module_id in self._sys_module_keys:
+            self._sys_module_keys.discard(module_id)
+            sys.modules.pop(module_id, None)
 
         await self.state.delete_module(module_id)
+        self._invalidate_cache()
         return True
 
     async def get(self, module_id: str) -> Optional[dict]:
-        """Get module information."""
-        return await self.state.get_module(module_id)
+        """Get module information.
+
+        Results are cached briefly and shared between callers; treat the
+        returned dict as read-only.
+        """
+        return await self._module_cache.get(
+            module_id, lambda: self.state.get_module(module_id)
+        )
 
     async def list(self) -> list[dict]:
-        """List all installed modules."""
-        return await self.state.list_modules()
+        """List all installed modules (cached like get())."""
+        return await self._list_cache.get(None, self.state.list_modules)
 
     async def load_class(self, module_id: str) -> Any:
         """Load and return the module class."""
         if module_id in self._loaded_modules:
             return self._loaded_modules[module_id]
 
-        module_info = await self.state.get_module(module_id)
+        # Another loader in this process may have imported it already.
+        module_class = getattr(sys.modules.get(module_id), "_sweatpants_class", None)
+        if module_class is not None:
+            self._sys_module_keys.add(module_id)
+            self._loaded_modules[module_id] = module_class
+            return module_class
+
+        module_info = await self.get(module_id)
         if not module_info:
             raise ValueError(f"Module not found: {module_id}")
 
@@ -245,53 +466,70 @@ class ModuleLoader:
 
         loaded_module = importlib.util.module_from_spec(spec)
         sys.modules[module_id] = loaded_module
+        self._sys_module_keys.add(module_id)
         spec.loader.exec_module(loaded_module)
 
         from sweatpants.sdk.module import Module
 
-        module_class = None
-        for attr_name in dir(loaded_module):
-            attr = getattr(loaded_module, attr_name)
-            if (
-                isinstance(attr, type)
-                and issubclass(attr, Module)
-                and attr is not Module
-            ):
-                module_class = attr
-                break
+        # Module subclasses are tracked by Python itself, so look among those
+        # defined by this entrypoint first. The newest match wins, and it must
+        # still be bound in the namespace: classes from an earlier load of the
+        # same module can linger in __subclasses__() until collected.
+        namespace = vars(loaded_module)
+        module_class = next(
+            (
+                cls
+                for cls in reversed(Module.__subclasses__())
+                if cls.__module__ == module_id
+                and namespace.get(cls.__name__) is cls
+            ),
+            None,
+        )
+
+        if module_class is None:
+            # Indirect subclasses, or one imported from elsewhere.
+            for attr in namespace.values():
+                if (
+                    isinstance(attr, type)
+                    and issubclass(attr, Module)
+                    and attr is not Module
+                ):
+                    module_class = attr
+                    break
 
         if module_class is None:
             raise ImportError(f"No Module subclass found in {module_id}")
 
+        loaded_module._sweatpants_class = module_class
         self._loaded_modules[module_id] = module_class
         return module_class
 
     async def reload_all(self) -> dict:
         """Reload all modules from disk.
 
-        Clears the in-memory module cache and Python's sys.modules cache
-        for all loaded module entrypoints, then re-discovers modules from
-        the modules directory.
+        Clears the in-memory module cache and the sys.modules entries this
+        loader registered for module entrypoints, then re-discovers modules
+        from the modules directory.
 
         Returns summary of reloaded modules.
         """
-        # Clear Python's import cache for loaded modules
-        modules_to_remove = [
-            key for key in sys.modules
-            if key.startswith("sweatpants_module_") or str(self.settings.modules_dir) in str(getattr(sys.modules[key], '__file__', '') or '')
-        ]
-        for key in modules_to_remove:
-            del sys.modules[key]
+        # Clear Python's import cache for the entrypoints we loaded
+        cleared = 0
+        for key in self._sys_module_keys:
+            if sys.modules.pop(key, None) is not None:
+                cleared += 1
+        self._sys_module_keys.clear()
 
         # Clear instance cache
         self._loaded_modules.clear()
+        self._invalidate_cache()
 
         # Re-discover all modules
         modules = await self.list()
 
         return {
             "status": "reloaded",
-            "cleared_cache_entries": len(modules_to_remove),
+            "cleared_cache_entries": cleared,
             "modules_found": len(modules),
             "modules": modules,
         }
@@ -309,36 +547,51 @@ class ModuleLoader:
         if not modules_dir.exists():
             return 0
 
-        discovered = 0
-        for subdir in modules_dir.iterdir():
-            if not subdir.is_dir():
-                continue
+        manifests = await asyncio.to_thread(_read_manifests, modules_dir)
 
-            manifest_path = subdir / "module.json"
-            if not manifest_path.exists():
+        candidates = []
+        for subdir, manifest_data in manifests:
+            if isinstance(manifest_data, Exception):
+                print(f"Error discovering module in {subdir.name}: {manifest_data}")
                 continue
+            module_id = manifest_data.get("id") if isinstance(manifest_data, dict) else None
+            if not module_id:
+                print(f"Warning: module.json in {subdir.name} has no id, skipping")
+                continue
+            candidates.append((subdir, module_id))
 
-            try:
-                with open(manifest_path) as f:
-                    manifest_data = json.load(f)
-
-                module_id = manifest_data.get("id")
-                if not module_id:
-                    print(f"Warning: module.json in {subdir.name} has no id, skipping")
-                    continue
+        # Check registrations, then stage the new modules, concurrently.
+        existing = await asyncio.gather(
+            *(self.state.get_module(module_id) for _, module_id in candidates)
+        )
+        new = [candidate for candidate, found in zip(candidates, existing) if not found]
+        for _, module_id in new:
+            print(f"Discovered unregistered module: {module_id}")
 
-                existing = await self.state.get_module(module_id)
-                if existing:
-                    continue
+        outcomes = await asyncio.gather(
+            *(self._stage(subdir) for subdir, _ in new), return_exceptions=True
+        )
+        staged = []
+        for (subdir, _), outcome in zip(new, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"Error discovering module in {subdir.name}: {outcome}")
+            else:
+                staged.append((subdir, *outcome))
 
-                print(f"Discovered unregistered module: {module_id}")
-                await self.install(str(subdir))
-                print(f"Auto-installed module: {module_id}")
-                discovered += 1
+        errors = await self._install_requirements_batch([dest for *_, dest in staged])
 
+        discovered = 0
+        for subdir, manifest, dest in staged:
+            if dest in errors:
+                print(f"Error discovering module in {subdir.name}: {errors[dest]}")
+                continue
+            try:
+                await self._register(manifest, dest)
             except Exception as e:
                 print(f"Error discovering module in {subdir.name}: {e}")
                 continue
+            print(f"Auto-installed module: {manifest.id}")
+            discovered += 1
 
         return discovered
 
@@ -371,8 +624,10 @@ class ModuleLoader:
         """Sync modules from configured module sources.
 
         Reads module_sources from modules.yaml config, clones/pulls each repo,
-        and installs the specified modules. Handles errors gracefully by skipping
-        failed repos and continuing with others.
+        and installs the specified modules. Each repo is cloned once, all of
+        them concurrently, and all requirements are installed with a single
+        pip run. Handles errors gracefully by skipping failed repos and
+        continuing with others.
 
         Returns:
             Summary dict with installed, failed, and skipped modules.
@@ -386,54 +641,65 @@ class ModuleLoader:
         failed = []
         skipped = []
 
+        def record_failure(repo_url: str, module_name: Optional[str], error: BaseException) -> None:
+            module_display = module_name if module_name else "(root)"
+            failed.append({
+                "module": module_display,
+                "source": repo_url,
+                "error": str(error),
+            })
+            print(f"Failed: {module_display} from {repo_url} - {error}")
+
+        # Group the modules by repository so each one is cloned only once. If
+        # no specific modules are listed for a source, install from the repo root.
+        repos: dict[str, list[Optional[str]]] = {}
         for source in modules_config.module_sources:
-            repo_url = source.repo
-            modules_to_install = source.modules
-
-            # If no specific modules listed, try to install from repo root
-            if not modules_to_install:
-                modules_to_install = [None]
-
-            for module_name in modules_to_install:
-                module_display = module_name if module_name else "(root)"
-
-                try:
-                    manifest = await self.install_from_git(
-                        repo_url=repo_url,
-                        module_name=module_name,
-                    )
-                    installed.append({
-                        "id": manifest.id,
-                        "name": manifest.name,
-                        "version": manifest.version,
-                        "source": repo_url,
-                        "module_path": module_name,
-                    })
-                    print(f"Installed: {manifest.id} from {repo_url}/{module_display}")
-
-                except FileNotFoundError as e:
-                    failed.append({
-                        "module": module_display,
-                        "source": repo_url,
-                        "error": str(e),
-                    })
-                    print(f"Failed: {module_display} from {repo_url} - {e}")
-
-                except ValueError as e:
-                    failed.append({
-                        "module": module_display,
-                        "source": repo_url,
-                        "error": str(e),
-                    })
-                    print(f"Failed: {module_display} from {repo_url} - {e}")
-
-                except Exception as e:
-                    failed.append({
-                        "module": module_display,
-                        "source": repo_url,
-                        "error": str(e),
-                    })
-                    print(f"Failed: {module_display} from {repo_url} - {e}")
+            repos.setdefault(source.repo, []).extend(source.modules or [None])
+
+        # Phase 1: clone every repository and stage its modules concurrently.
+        # Module IDs are claimed across all repositories, so two sources of
+        # the same module can't be copied into its directory at once.
+        claimed: set[str] = set()
+        fetched = await asyncio.gather(
+            *(
+                self._fetch_from_git(repo_url, names, claimed)
+                for repo_url, names in repos.items()
+            ),
+            return_exceptions=True,
+        )
+        staged = []
+        for (repo_url, module_names), outcomes in zip(repos.items(), fetched):
+            if isinstance(outcomes, BaseException):
+                outcomes = [outcomes] * len(module_names)
+            for module_name, outcome in zip(module_names, outcomes):
+                if isinstance(outcome, BaseException):
+                    record_failure(repo_url, module_name, outcome)
+                else:
+                    staged.append((repo_url, module_name, *outcome))
+
+        # Phase 2: install all requirements with a single pip run.
+        errors = await self._install_requirements_batch([dest for *_, dest in staged])
+        for repo_url, module_name, _, dest in staged:
+            if dest in errors:
+                record_failure(repo_url, module_name, errors[dest])
+        staged = [entry for entry in staged if entry[3] not in errors]
+
+        # Phase 3: register the modules.
+        for repo_url, module_name, manifest, dest in staged:
+            try:
+                await self._register(manifest, dest)
+            except Exception as e:
+                record_failure(repo_url, module_name, e)
+                continue
+            installed.append({
+                "id": manifest.id,
+                "name": manifest.name,
+                "version": manifest.version,
+                "source": repo_url,
+                "module_path": module_name,
+            })
+            module_display = module_name if module_name else "(root)"
+            print(f"Installed: {manifest.id} from {repo_url}/{module_display}")
 
         return {
             "installed": installed,
@@ -1,13 +1,25 @@
 """SQLite state persistence for jobs, modules, and results."""
 
-import json
-from datetime import datetime, timezone
-from typing import Any, Optional
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
 from uuid import uuid4
 
 import aiosqlite
+import orjson
 
 from sweatpants.config import get_settings
+from sweatpants.utils import BatchWriter, utc_timestamp
+
+# Log entries are written in batches: once this many are pending, or this many
+# seconds after the first of a batch was added, whichever comes first.
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 0.05
+
+# Rows fetched per round trip by StateManager.iter_jobs().
+JOB_FETCH_SIZE = 100
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS modules (
@@ -56,6 +68,7 @@ CREATE TABLE IF NOT EXISTS job_results (
 
 CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
 CREATE INDEX IF NOT EXISTS idx_jobs_module ON jobs(module_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
 CREATE INDEX IF NOT EXISTS idx_job_logs_job ON job_logs(job_id);
 CREATE INDEX IF NOT EXISTS idx_job_results_job ON job_results(job_id);
 
@@ -74,20 +87,217 @@ CREATE INDEX IF NOT EXISTS idx_callbacks_received_at ON callbacks(received_at);
 """
 
 
+# Hot write statements. sqlite3 caches prepared statements by their exact SQL
+# text, so each is spelled once here and every caller shares its cache entry.
+_INSERT_LOG = (
+    "INSERT INTO job_logs (job_id, level, message, timestamp) VALUES (?, ?, ?, ?)"
+)
+_INSERT_RESULT = "INSERT INTO job_results (job_id, data, created_at) VALUES (?, ?, ?)"
+
+
+_CALLBACK_COLUMNS = "id, callback_id, source, status, payload, received_at"
+
+
+def _callback_from_row(row: Any) -> dict:
+    """Build a callback dict from a row selected with _CALLBACK_COLUMNS."""
+    id_, callback_id, source, status, payload, received_at = row
+    return {
+        "id": id_,
+        "callback_id": callback_id,
+        "source": source,
+        "status": status,
+        "payload": orjson.loads(payload) if payload else {},
+        "received_at": received_at,
+    }
+
+
+# Non-string keys are stringified, as the json module used to do; naive
+# datetimes are taken as UTC. Values orjson can't encode natively (Path,
+# Decimal, ...) are stored as their str().
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _dumps(value: Any) -> bytes:
+    """Encode a value as JSON for storage.
+
+    The encoded bytes are stored as they are, so JSON columns hold BLOBs
+    (rows written by older versions hold TEXT); orjson.loads reads both.
+    """
+    return orjson.dumps(value, default=str, option=_DUMPS_OPTIONS)
+
+
+def _id_prefix_range(prefix: str) -> tuple[str, str]:
+    """Bounds for matching IDs by prefix with `id >= ? AND id < ?`.
+
+    Unlike `LIKE 'prefix%'`, a range can be answered from the primary key
+    index. IDs are lowercase UUIDs, so the prefix is lowercased to keep
+    lookups case-insensitive as LIKE made them.
+    """
+    prefix = prefix.lower()
+    return prefix, prefix + "\U0010ffff"
+
+
+# Shared connections, one per database file. Opening a connection starts a
+# worker thread, so StateManager instances reuse these instead of connecting
+# on every call. Writes on a connection are serialized by its lock in
+# _write_locks so concurrent callers never commit each other's statements.
+# Reads go to a few read-only connections in _readers instead, so under WAL
+# they neither wait behind writes nor for each other.
+_connections: dict[str, aiosqlite.Connection] = {}
+_write_locks: dict[str, asyncio.Lock] = {}
+_readers: dict[str, list[aiosqlite.Connection]] = {}
+_reader_turn = itertools.count()
+_connect_lock = asyncio.Lock()
+
+# Read-only connections opened per database file.
+READER_CONNECTIONS = 4
+
+# maintain_database() checkpoints the WAL this often, in seconds, and runs
+# PRAGMA optimize on every OPTIMIZE_EVERY-th checkpoint.
+CHECKPOINT_INTERVAL = 60.0
+OPTIMIZE_EVERY = 5
+
+# Applied to the write connection when it is opened. WAL lets readers run
+# alongside the writer, and synchronous=NORMAL is still crash-safe under WAL.
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+# Applied to every shared connection when it is opened.
+_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=3000",
+)
+
+
+async def get_connection(db_path: str) -> aiosqlite.Connection:
+    """Get the shared connection for a database file, opening it on first use."""
+    db = _connections.get(db_path)
+    if db is None:
+        async with _connect_lock:
+            db = _connections.get(db_path)
+            if db is None:
+                db = await aiosqlite.connect(db_path)
+                for pragma in (*_WRITER_PRAGMAS, *_PRAGMAS):
+                    await db.execute(pragma)
+                _write_locks[db_path] = asyncio.Lock()
+                _connections[db_path] = db
+    return db
+
+
+async def get_reader(db_path: str) -> aiosqlite.Connection:
+    """Get a read-only connection for a database file, opening them on first use.
+
+    Callers are spread round-robin over READER_CONNECTIONS connections.
+    """
+    readers = _readers.get(db_path)
+    if readers is None:
+        # The write connection creates the file and switches it to WAL first.
+        await get_connection(db_path)
+        async with _connect_lock:
+            readers = _readers.get(db_path)
+            if readers is None:
+                uri = f"{Path(db_path).absolute().as_uri()}?mode=ro"
+                readers = []
+                for _ in range(READER_CONNECTIONS):
+                    db = await aiosqlite.connect(uri, uri=True)
+                    for pragma in _PRAGMAS:
+                        await db.execute(pragma)
+                    readers.append(db)
+                _readers[db_path] = readers
+    return readers[next(_reader_turn) % len(readers)]
+
+
+async def close_database() -> None:
+    """Close all shared database connections.
+
+    Must be called before the process exits: each open connection keeps a
+    non-daemon worker thread alive.
+    """
+    connections = list(_connections.values())
+    for readers in _readers.values():
+        connections.extend(readers)
+    _connections.clear()
+    _write_locks.clear()
+    _readers.clear()
+    for db in connections:
+        await db.close()
+
+
 async def init_database() -> None:
     """Initialize the database schema."""
     settings = get_settings()
     async with aiosqlite.connect(settings.db_path) as db:
+        # The journal mode is stored in the database file, so set it here too.
+        await db.execute("PRAGMA journal_mode=WAL")
         await db.executescript(SCHEMA)
         await db.commit()
 
 
+async def maintain_database() -> None:
+    """Run periodic database upkeep until cancelled.
+
+    Every CHECKPOINT_INTERVAL seconds the WAL is checkpointed and truncated,
+    so steady writes can't grow it without bound; every OPTIMIZE_EVERY
+    checkpoints, PRAGMA optimize refreshes the query planner's statistics.
+    """
+    db_path = str(get_settings().db_path)
+    for tick in itertools.count(1):
+        await asyncio.sleep(CHECKPOINT_INTERVAL)
+        try:
+            db = await get_connection(db_path)
+            async with _write_locks[db_path]:
+                async with db.execute("PRAGMA wal_checkpoint(TRUNCATE)") as cursor:
+                    busy, log_pages, checkpointed = await cursor.fetchone()
+                if tick % OPTIMIZE_EVERY == 0:
+                    await db.execute("PRAGMA optimize")
+        except Exception as e:
+            print(f"Warning: database maintenance failed: {e}")
+            continue
+        if busy:
+            # A reader kept the WAL from being reset; it is retried next time.
+            print(
+                f"Warning: WAL checkpoint incomplete "
+                f"({checkpointed} of {log_pages} pages written)"
+            )
+
+
 class StateManager:
     """Manages persistent state in SQLite."""
 
     def __init__(self) -> None:
         self.settings = get_settings()
         self._db_path = str(self.settings.db_path)
+        self._logs: BatchWriter[tuple[str, str, str, str]] = BatchWriter(
+            self._write_logs, LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL
+        )
+
+    async def _db(self) -> aiosqlite.Connection:
+        """Get the shared write connection for this manager's database."""
+        return await get_connection(self._db_path)
+
+    async def _reader(self) -> aiosqlite.Connection:
+        """Get a shared read-only connection for this manager's database."""
+        return await get_reader(self._db_path)
+
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a write transaction on the shared connection.
+
+        Commits when the block exits and rolls back if it raises. The
+        connection's write lock is held throughout.
+        """
+        db = await self._db()
+        async with _write_locks[self._db_path]:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
 
     async def save_module(
         self,
@@ -102,7 +312,7 @@ class StateManager:
         path: str,
     ) -> None:
         """Save or update a module record."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             await db.execute(
                 """
                 INSERT OR REPLACE INTO modules
@@ -115,65 +325,68 @@ class StateManager:
                     version,
                     description,
                     entrypoint,
-                    json.dumps(inputs),
-                    json.dumps(settings),
-                    json.dumps(capabilities),
-                    datetime.now(timezone.utc).isoformat(),
+                    _dumps(inputs),
+                    _dumps(settings),
+                    _dumps(capabilities),
+                    utc_timestamp(),
                     path,
                 ),
             )
-            await db.commit()
 
     async def get_module(self, module_id: str) -> Optional[dict]:
         """Get a module by ID."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM modules WHERE id = ?", (module_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        "id": row["id"],
-                        "name": row["name"],
-                        "version": row["version"],
-                        "description": row["description"],
-                        "entrypoint": row["entrypoint"],
-                        "inputs": json.loads(row["inputs"]) if row["inputs"] else [],
-                        "settings": json.loads(row["settings"]) if row["settings"] else [],
-                        "capabilities": (
-                            json.loads(row["capabilities"]) if row["capabilities"] else []
-                        ),
-                        "installed_at": row["installed_at"],
-                        "path": row["path"],
-                    }
-                return None
+        db = await self._reader()
+        async with db.execute(
+            """
+            SELECT id, name, version, description, entrypoint, inputs, settings,
+                   capabilities, installed_at, path
+            FROM modules WHERE id = ?
+            """,
+            (module_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                (
+                    id_, name, version, description, entrypoint,
+                    inputs, settings, capabilities, installed_at, path,
+                ) = row
+                return {
+                    "id": id_,
+                    "name": name,
+                    "version": version,
+                    "description": description,
+                    "entrypoint": entrypoint,
+                    "inputs": orjson.loads(inputs) if inputs else [],
+                    "settings": orjson.loads(settings) if settings else [],
+                    "capabilities": orjson.loads(capabilities) if capabilities else [],
+                    "installed_at": installed_at,
+                    "path": path,
+                }
+            return None
 
     async def list_modules(self) -> list[dict]:
         """List all installed modules."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM modules ORDER BY name") as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        "id": row["id"],
-                        "name": row["name"],
-                        "version": row["version"],
-                        "description": row["description"],
-                        "capabilities": (
-                            json.loads(row["capabilities"]) if row["capabilities"] else []
-                        ),
-                    }
-                    for row in rows
-                ]
+        db = await self._reader()
+        async with db.execute(
+            "SELECT id, name, version, description, capabilities FROM modules ORDER BY name"
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [
+                {
+                    "id": id_,
+                    "name": name,
+                    "version": version,
+                    "description": description,
+                    "capabilities": orjson.loads(capabilities) if capabilities else [],
+                }
+                for id_, name, version, description, capabilities in rows
+            ]
 
     async def delete_module(self, module_id: str) -> bool:
         """Delete a module record."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             cursor = await db.execute("DELETE FROM modules WHERE id = ?", (module_id,))
-            await db.commit()
-            return cursor.rowcount > 0
+        return cursor.rowcount > 0
 
     async def create_job(
         self,
@@ -183,7 +396,7 @@ class StateManager:
     ) -> str:
         """Create a new job record."""
         job_id = str(uuid4())
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             await db.execute(
                 """
                 INSERT INTO jobs (id, module_id, status, inputs, settings, created_at)
@@ -192,12 +405,11 @@ class StateManager:
                 (
                     job_id,
                     module_id,
-                    json.dumps(inputs),
-                    json.dumps(settings),
-                    datetime.now(timezone.utc).isoformat(),
+                    _dumps(inputs),
+                    _dumps(settings),
+                    utc_timestamp(),
                 ),
             )
-            await db.commit()
         return job_id
 
     async def update_job_status(
@@ -208,210 +420,266 @@ class StateManager:
         checkpoint: Optional[dict] = None,
     ) -> None:
         """Update job status."""
-        async with aiosqlite.connect(self._db_path) as db:
-            now = datetime.now(timezone.utc).isoformat()
-
-            if status == "running":
-                await db.execute(
-                    "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
-                    (status, now, job_id),
-                )
-            elif status in ("completed", "failed", "stopped"):
-                await db.execute(
-                    "UPDATE jobs SET status = ?, completed_at = ?, error = ? WHERE id = ?",
-                    (status, now, error, job_id),
-                )
-            else:
-                await db.execute(
-                    "UPDATE jobs SET status = ? WHERE id = ?",
-                    (status, job_id),
-                )
-
-            if checkpoint is not None:
-                await db.execute(
-                    "UPDATE jobs SET checkpoint = ? WHERE id = ?",
-                    (json.dumps(checkpoint), job_id),
-                )
+        now = utc_timestamp()
+        columns = ["status = ?"]
+        params: list[Any] = [status]
+
+        if status == "running":
+            columns.append("started_at = ?")
+            params.append(now)
+        elif status in ("completed", "failed", "stopped"):
+            columns.extend(("completed_at = ?", "error = ?"))
+            params.extend((now, error))
+
+        if checkpoint is not None:
+            columns.append("checkpoint = ?")
+            params.append(_dumps(checkpoint))
+
+        params.append(job_id)
+        async with self._write() as db:
+            await db.execute(
+                f"UPDATE jobs SET {', '.join(columns)} WHERE id = ?", params
+            )
 
-            await db.commit()
+    async def merge_checkpoint(self, job_id: str, data: dict[str, Any]) -> None:
+        """Set top-level keys in a job's stored checkpoint, keeping the others.
+
+        Only `data` is encoded; SQLite updates the stored checkpoint with
+        json_set. Keys must not contain double quotes, which JSON paths
+        can't express.
+        """
+        if not data:
+            return
+        paths = ", ".join("?, json(?)" for _ in data)
+        params: list[Any] = []
+        for key, value in data.items():
+            params.extend((f'$."{key}"', _dumps(value).decode()))
+        params.append(job_id)
+        async with self._write() as db:
+            await db.execute(
+                "UPDATE jobs SET checkpoint = "
+                f"json_set(CAST(COALESCE(checkpoint, '{{}}') AS TEXT), {paths}) WHERE id = ?",
+                params,
+            )
 
     async def get_job(self, job_id: str) -> Optional[dict]:
         """Get a job by ID (supports partial ID matching)."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM jobs WHERE id = ? OR id LIKE ?",
-                (job_id, f"{job_id}%"),
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        "id": row["id"],
-                        "module_id": row["module_id"],
-                        "status": row["status"],
-                        "inputs": json.loads(row["inputs"]) if row["inputs"] else {},
-                        "settings": json.loads(row["settings"]) if row["settings"] else {},
-                        "created_at": row["created_at"],
-                        "started_at": row["started_at"],
-                        "completed_at": row["completed_at"],
-                        "error": row["error"],
-                        "checkpoint": (
-                            json.loads(row["checkpoint"]) if row["checkpoint"] else None
-                        ),
-                    }
-                return None
+        db = await self._reader()
+        async with db.execute(
+            """
+            SELECT id, module_id, status, inputs, settings, created_at,
+                   started_at, completed_at, error, checkpoint
+            FROM jobs WHERE id >= ? AND id < ? LIMIT 1
+            """,
+            _id_prefix_range(job_id),
+        ) as cursor:
+            row = await cursor.fetchone()
+            if row:
+                (
+                    id_, module_id, status, inputs, settings, created_at,
+                    started_at, completed_at, error, checkpoint,
+                ) = row
+                return {
+                    "id": id_,
+                    "module_id": module_id,
+                    "status": status,
+                    "inputs": orjson.loads(inputs) if inputs else {},
+                    "settings": orjson.loads(settings) if settings else {},
+                    "created_at": created_at,
+                    "started_at": started_at,
+                    "completed_at": completed_at,
+                    "error": error,
+                    "checkpoint": orjson.loads(checkpoint) if checkpoint else None,
+                }
+            return None
 
     async def _resolve_job_id(self, job_id: str) -> Optional[str]:
         """Resolve a partial job ID to full ID."""
-        async with aiosqlite.connect(self._db_path) as db:
-            async with db.execute(
-                "SELECT id FROM jobs WHERE id = ? OR id LIKE ? LIMIT 1",
-                (job_id, f"{job_id}%"),
-            ) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row else None
+        db = await self._reader()
+        async with db.execute(
+            "SELECT id FROM jobs WHERE id >= ? AND id < ? LIMIT 1",
+            _id_prefix_range(job_id),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else None
 
     async def list_jobs(self, status: Optional[str] = None) -> list[dict]:
         """List jobs, optionally filtered by status."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            if status:
-                query = "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC"
-                cursor = await db.execute(query, (status,))
-            else:
-                query = "SELECT * FROM jobs ORDER BY created_at DESC"
-                cursor = await db.execute(query)
+        return [job async for job in self.iter_jobs(status)]
+
+    async def iter_jobs(self, status: Optional[str] = None) -> AsyncIterator[dict]:
+        """Yield jobs newest first, optionally filtered by status.
+
+        Rows are fetched JOB_FETCH_SIZE at a time, so a long job history
+        can be walked without building it all up front. The query holds a
+        read snapshot on a shared reader connection until the generator
+        finishes, which blocks WAL checkpoints; callers that may stop early
+        must close it, e.g. with contextlib.aclosing().
+        """
+        db = await self._reader()
+        columns = "id, module_id, status, created_at, started_at, completed_at"
+        if status:
+            query = f"SELECT {columns} FROM jobs WHERE status = ? ORDER BY created_at DESC"
+            params: tuple = (status,)
+        else:
+            query = f"SELECT {columns} FROM jobs ORDER BY created_at DESC"
+            params = ()
+
+        cursor = await db.execute(query, params)
+        try:
+            while rows := await cursor.fetchmany(JOB_FETCH_SIZE):
+                for id_, module_id, job_status, created_at, started_at, completed_at in rows:
+                    yield {
+                        "id": id_,
+                        "module_id": module_id,
+                        "status": job_status,
+                        "created_at": created_at,
+                        "started_at": started_at,
+                        "completed_at": completed_at,
+                    }
+        finally:
+            await cursor.close()
 
+    async def get_resumable_jobs(self) -> list[dict]:
+        """Get jobs that were running and can be resumed."""
+        db = await self._reader()
+        async with db.execute(
+            """
+            SELECT id, module_id, inputs, settings, checkpoint
+            FROM jobs WHERE status = 'running' ORDER BY started_at
+            """
+        ) as cursor:
             rows = await cursor.fetchall()
             return [
                 {
-                    "id": row["id"],
-                    "module_id": row["module_id"],
-                    "status": row["status"],
-                    "created_at": row["created_at"],
-                    "started_at": row["started_at"],
-                    "completed_at": row["completed_at"],
+                    "id": id_,
+                    "module_id": module_id,
+                    "inputs": orjson.loads(inputs) if inputs else {},
+                    "settings": orjson.loads(settings) if settings else {},
+                    "checkpoint": orjson.loads(checkpoint) if checkpoint else None,
                 }
-                for row in rows
+                for id_, module_id, inputs, settings, checkpoint in rows
             ]
 
-    async def get_resumable_jobs(self) -> list[dict]:
-        """Get jobs that were running and can be resumed."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM jobs WHERE status = 'running' ORDER BY started_at"
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        "id": row["id"],
-                        "module_id": row["module_id"],
-                        "inputs": json.loads(row["inputs"]) if row["inputs"] else {},
-                        "settings": json.loads(row["settings"]) if row["settings"] else {},
-                        "checkpoint": (
-                            json.loads(row["checkpoint"]) if row["checkpoint"] else None
-                        ),
-                    }
-                    for row in rows
-                ]
-
     async def add_log(self, job_id: str, level: str, message: str) -> None:
-        """Add a log entry for a job."""
-        async with aiosqlite.connect(self._db_path) as db:
-            await db.execute(
-                """
-                INSERT INTO job_logs (job_id, level, message, timestamp)
-                VALUES (?, ?, ?, ?)
-                """,
-                (job_id, level, message, datetime.now(timezone.utc).isoformat()),
-            )
-            await db.commit()
+        """Add a log entry for a job.
+
+        Entries are written in batches; flush() writes any that are still
+        pending.
+        """
+        await self._logs.add((job_id, level, message, utc_timestamp()))
+
+    async def _write_logs(self, batch: list[tuple[str, str, str, str]]) -> None:
+        """Insert a batch of log entries."""
+        async with self._write() as db:
+            await db.executemany(_INSERT_LOG, batch)
+
+    async def flush(self) -> None:
+        """Write all pending log entries to the database."""
+        await self._logs.flush()
 
     async def get_logs(
         self, job_id: str, limit: int = 100, after_id: Optional[int] = None
     ) -> list[dict]:
         """Get log entries for a job."""
+        await self.flush()
         full_job_id = await self._resolve_job_id(job_id)
         if not full_job_id:
             return []
 
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-
-            if after_id:
-                query = """
-                    SELECT * FROM job_logs
-                    WHERE job_id = ? AND id > ?
-                    ORDER BY id LIMIT ?
-                """
-                cursor = await db.execute(query, (full_job_id, after_id, limit))
-            else:
-                query = """
-                    SELECT * FROM job_logs
+        db = await self._reader()
+        if after_id:
+            query = """
+                SELECT id, level, message, timestamp FROM job_logs
+                WHERE job_id = ? AND id > ?
+                ORDER BY id LIMIT ?
+            """
+            rows = await db.execute_fetchall(query, (full_job_id, after_id, limit))
+        else:
+            # The newest entries, put back in chronological order by SQLite.
+            query = """
+                SELECT * FROM (
+                    SELECT id, level, message, timestamp FROM job_logs
                     WHERE job_id = ?
                     ORDER BY id DESC LIMIT ?
-                """
-                cursor = await db.execute(query, (full_job_id, limit))
+                ) ORDER BY id
+            """
+            rows = await db.execute_fetchall(query, (full_job_id, limit))
 
-            rows = await cursor.fetchall()
-            return [
-                {
-                    "id": row["id"],
-                    "level": row["level"],
-                    "message": row["message"],
-                    "timestamp": row["timestamp"],
-                }
-                for row in (reversed(rows) if not after_id else rows)
-            ]
+        return [
+            {"id": id_, "level": level, "message": message, "timestamp": timestamp}
+            for id_, level, message, timestamp in rows
+        ]
 
     async def add_result(self, job_id: str, data: dict[str, Any]) -> None:
         """Add a result entry for a job."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             await db.execute(
-                """
-                INSERT INTO job_results (job_id, data, created_at)
-                VALUES (?, ?, ?)
-                """,
-                (job_id, json.dumps(data), datetime.now(timezone.utc).isoformat()),
+                _INSERT_RESULT,
+                (job_id, _dumps(data), utc_timestamp()),
+            )
+
+    async def add_results(self, job_id: str, items: list[dict[str, Any]]) -> None:
+        """Add several result entries for a job in one statement."""
+        created_at = utc_timestamp()
+        async with self._write() as db:
+            await db.executemany(
+                _INSERT_RESULT, [(job_id, _dumps(data), created_at) for data in items]
             )
-            await db.commit()
 
     async def get_results(self, job_id: str, limit: int = 1000) -> list[dict]:
         """Get results for a job."""
         full_job_id = await self._resolve_job_id(job_id)
         if not full_job_id:
             return []
+        return await self._fetch_results(full_job_id, limit)
 
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM job_results WHERE job_id = ? ORDER BY id LIMIT ?",
-                (full_job_id, limit),
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        "id": row["id"],
-                        "data": json.loads(row["data"]),
-                        "created_at": row["created_at"],
-                    }
-                    for row in rows
-                ]
+    async def get_results_with_count(
+        self, job_id: str, limit: int = 1000
+    ) -> tuple[list[dict], int]:
+        """Get a page of results for a job together with the job's total result count.
+
+        The page and the count are separate queries (the count is answered
+        from the job_id index alone), run at once on two reader connections.
+        """
+        full_job_id = await self._resolve_job_id(job_id)
+        if not full_job_id:
+            return [], 0
+
+        results, total = await asyncio.gather(
+            self._fetch_results(full_job_id, limit), self._count_results(full_job_id)
+        )
+        return results, total
 
     async def get_result_count(self, job_id: str) -> int:
         """Get the count of results for a job."""
         full_job_id = await self._resolve_job_id(job_id)
         if not full_job_id:
             return 0
+        return await self._count_results(full_job_id)
+
+    async def _fetch_results(self, full_job_id: str, limit: int) -> list[dict]:
+        """Get results for a job by its full ID."""
+        db = await self._reader()
+        async with db.execute(
+            "SELECT id, data, created_at FROM job_results WHERE job_id = ? ORDER BY id LIMIT ?",
+            (full_job_id, limit),
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return [
+                {"id": id_, "data": orjson.loads(data), "created_at": created_at}
+                for id_, data, created_at in rows
+            ]
 
-        async with aiosqlite.connect(self._db_path) as db:
-            async with db.execute(
-                "SELECT COUNT(*) FROM job_results WHERE job_id = ?",
-                (full_job_id,),
-            ) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row else 0
+    async def _count_results(self, full_job_id: str) -> int:
+        """Count the results of a job by its full ID."""
+        db = await self._reader()
+        async with db.execute(
+            "SELECT COUNT(*) FROM job_results WHERE job_id = ?",
+            (full_job_id,),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row else 0
 
     async def save_callback(
         self,
@@ -422,7 +690,7 @@ class StateManager:
     ) -> str:
         """Save a callback and return its ID."""
         cb_id = str(uuid4())
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             await db.execute(
                 """
                 INSERT INTO callbacks (id, callback_id, source, status, payload, received_at)
@@ -433,32 +701,21 @@ class StateManager:
                     callback_id,
                     source,
                     status,
-                    json.dumps(payload),
-                    datetime.now(timezone.utc).isoformat(),
+                    _dumps(payload),
+                    utc_timestamp(),
                 ),
             )
-            await db.commit()
         return cb_id
 
     async def get_callback(self, cb_id: str) -> Optional[dict]:
         """Get a callback by ID (supports partial ID matching)."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                "SELECT * FROM callbacks WHERE id = ? OR id LIKE ?",
-                (cb_id, f"{cb_id}%"),
-            ) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return {
-                        "id": row["id"],
-                        "callback_id": row["callback_id"],
-                        "source": row["source"],
-                        "status": row["status"],
-                        "payload": json.loads(row["payload"]) if row["payload"] else {},
-                        "received_at": row["received_at"],
-                    }
-                return None
+        db = await self._reader()
+        async with db.execute(
+            f"SELECT {_CALLBACK_COLUMNS} FROM callbacks WHERE id >= ? AND id < ? LIMIT 1",
+            _id_prefix_range(cb_id),
+        ) as cursor:
+            row = await cursor.fetchone()
+            return _callback_from_row(row) if row else None
 
     async def list_callbacks(
         self,
@@ -467,48 +724,35 @@ class StateManager:
         limit: int = 100,
     ) -> list[dict]:
         """List callbacks, optionally filtered by source or callback_id."""
-        async with aiosqlite.connect(self._db_path) as db:
-            db.row_factory = aiosqlite.Row
-
-            conditions = []
-            params: list[Any] = []
-
-            if source:
-                conditions.append("source = ?")
-                params.append(source)
-            if callback_id:
-                conditions.append("callback_id = ?")
-                params.append(callback_id)
-
-            where_clause = " AND ".join(conditions) if conditions else "1=1"
-            query = f"""
-                SELECT * FROM callbacks
-                WHERE {where_clause}
-                ORDER BY received_at DESC
-                LIMIT ?
-            """
-            params.append(limit)
-
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                return [
-                    {
-                        "id": row["id"],
-                        "callback_id": row["callback_id"],
-                        "source": row["source"],
-                        "status": row["status"],
-                        "payload": json.loads(row["payload"]) if row["payload"] else {},
-                        "received_at": row["received_at"],
-                    }
-                    for row in rows
-                ]
+        db = await self._reader()
+        conditions = []
+        params: list[Any] = []
+
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if callback_id:
+            conditions.append("callback_id = ?")
+            params.append(callback_id)
+
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        query = f"""
+            SELECT {_CALLBACK_COLUMNS} FROM callbacks
+            WHERE {where_clause}
+            ORDER BY received_at DESC
+            LIMIT ?
+        """
+        params.append(limit)
+
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+            return [_callback_from_row(row) for row in rows]
 
     async def delete_callback(self, cb_id: str) -> bool:
         """Delete a callback by ID."""
-        async with aiosqlite.connect(self._db_path) as db:
+        async with self._write() as db:
             cursor = await db.execute(
-                "DELETE FROM callbacks WHERE id = ? OR id LIKE ?",
-                (cb_id, f"{cb_id}%"),
+                "DELETE FROM callbacks WHERE id >= ? AND id < ?",
+                _id_prefix_range(cb_id),
             )
-            await db.commit()
-            return cursor.rowcount > 0
+        return cursor.rowcount > 0
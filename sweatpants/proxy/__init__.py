@@ -1,5 +1,10 @@
 """Proxy client for rotating proxy service integration."""
 
-from sweatpants.proxy.client import proxied_request, build_proxy_url, get_proxy_url
+from sweatpants.proxy.client import (
+    proxied_request,
+    proxied_stream,
+    build_proxy_url,
+    get_proxy_url,
+)
 
-__all__ = ["proxied_request", "build_proxy_url", "get_proxy_url"]
+__all__ = ["proxied_request", "proxied_stream", "build_proxy_url", "get_proxy_url"]
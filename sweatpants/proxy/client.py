@@ -1,24 +1,57 @@
 """HTTP client with rotating proxy support."""
 
-from typing import Any, Optional
+import asyncio
+import ssl
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Iterator, Optional
 
 import httpx
 
-from sweatpants.config import get_settings
+from sweatpants.config import Settings, get_settings
 
-BROWSER_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
+# Desktop Chrome user agent shared by browser-mode requests and pooled browsers.
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Read-only: browser-mode requests without custom headers share this mapping.
+BROWSER_HEADERS = MappingProxyType({
+    "User-Agent": DEFAULT_USER_AGENT,
     "Accept": (
         "text/html,application/xhtml+xml,application/xml;q=0.9,"
         "image/avif,image/webp,*/*;q=0.8"
     ),
     "Accept-Language": "en-US,en;q=0.9",
     "Accept-Encoding": "gzip, deflate, br",
-}
+})
+
+# Many proxy providers use self-signed certificates, so certificates are not
+# verified. One context serves every client instead of each building its own.
+_SSL_CONTEXT = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_SSL_CONTEXT.check_hostname = False
+_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+# Most shared clients kept open at once; past that, the least recently used
+# one is closed.
+MAX_CLIENTS = 32
+
+# Longest close_client() waits for clients to close, so a dead proxy can't
+# hold up shutdown.
+CLOSE_TIMEOUT = 5.0
+
+# Shared clients, one per proxy URL, so repeat requests skip building a client
+# (and, for sticky sessions, the proxy handshake). Insertion order is LRU order.
+# Each client is stored with the event loop it was created on: its connection
+# pool can't be used from another loop.
+_clients: dict[str, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_closing: set[asyncio.Task] = set()
+# Requests in flight per client. An evicted client that is still in use is
+# parked in _evicted and closed when its last request finishes.
+_in_use: dict[httpx.AsyncClient, int] = {}
+_evicted: dict[httpx.AsyncClient, asyncio.AbstractEventLoop] = {}
 
 
 def build_proxy_url(session_id: Optional[str] = None) -> str:
@@ -33,8 +66,11 @@ def build_proxy_url(session_id: Optional[str] = None) -> str:
     Raises:
         RuntimeError: If proxy URL not configured.
     """
-    settings = get_settings()
+    return _proxy_url_for(get_settings(), session_id)
+
 
+def _proxy_url_for(settings: Settings, session_id: Optional[str]) -> str:
+    """build_proxy_url() against already-loaded settings."""
     if not settings.proxy_url:
         raise RuntimeError("Proxy not configured. Set SWEATPANTS_PROXY_URL.")
 
@@ -51,6 +87,92 @@ def get_proxy_url() -> str:
     return build_proxy_url()
 
 
+def _get_client(proxy_url: str, sticky: bool) -> httpx.AsyncClient:
+    """Get the shared client for a proxy URL, creating it on first use.
+
+    Sticky-session clients keep their proxy connections alive so the session
+    stays on one IP. The rotating client does not, so every request still
+    opens a new proxy connection (and gets a new IP). Synchronous on purpose,
+    like the browser pool registry: with no await between lookup and insert,
+    concurrent first requests can't each create (and leak) a client.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _clients.pop(proxy_url, None)
+    if entry is not None and entry[0] is loop:
+        client = entry[1]
+    else:
+        # A client left over from a finished event loop is dropped unclosed;
+        # its loop is gone, so there is nothing left to close it on.
+        settings = get_settings()
+        client = httpx.AsyncClient(
+            proxy=proxy_url,
+            timeout=httpx.Timeout(30.0),
+            follow_redirects=True,
+            verify=_SSL_CONTEXT,
+            limits=httpx.Limits(
+                max_connections=settings.proxy_max_connections,
+                max_keepalive_connections=settings.proxy_max_keepalive if sticky else 0,
+                keepalive_expiry=30.0,
+            ),
+        )
+    _clients[proxy_url] = (loop, client)
+
+    if len(_clients) > MAX_CLIENTS:
+        oldest_loop, oldest = _clients.pop(next(iter(_clients)))
+        if oldest_loop is loop:
+            if _in_use.get(oldest):
+                _evicted[oldest] = loop
+            else:
+                _close_later(oldest)
+    return client
+
+
+def _close_later(client: httpx.AsyncClient) -> None:
+    """Close a client in the background; close_client() waits for it."""
+    task = asyncio.create_task(client.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+@contextmanager
+def _leased_client(proxy_url: str, sticky: bool) -> Iterator[httpx.AsyncClient]:
+    """Use the shared client for a proxy URL, keeping it open until done.
+
+    While leased, the client is never closed by eviction; if it was evicted
+    meanwhile, it is closed once its last lease ends.
+    """
+    client = _get_client(proxy_url, sticky)
+    _in_use[client] = _in_use.get(client, 0) + 1
+    try:
+        yield client
+    finally:
+        remaining = _in_use.pop(client) - 1
+        if remaining:
+            _in_use[client] = remaining
+        elif _evicted.pop(client, None) is not None:
+            _close_later(client)
+
+
+async def close_client() -> None:
+    """Close every shared proxy client.
+
+    Safe to call more than once. Clients that haven't closed within
+    CLOSE_TIMEOUT seconds are abandoned.
+    """
+    loop = asyncio.get_running_loop()
+    clients = [client for client_loop, client in _clients.values() if client_loop is loop]
+    clients.extend(client for client, client_loop in _evicted.items() if client_loop is loop)
+    _clients.clear()
+    _evicted.clear()
+    closing = asyncio.gather(
+        *(client.aclose() for client in clients), *_closing, return_exceptions=True
+    )
+    try:
+        await asyncio.wait_for(closing, CLOSE_TIMEOUT)
+    except asyncio.TimeoutError:
+        pass
+
+
 async def proxied_request(
     method: str,
     url: str,
@@ -79,28 +201,88 @@ async def proxied_request(
     Returns:
         httpx.Response
     """
-    proxy_url = build_proxy_url(session_id=session_id)
+    proxy_url, sticky, kwargs = _prepare_request(
+        headers, params, data, json, timeout, browser_mode, session_id
+    )
+    with _leased_client(proxy_url, sticky) as client:
+        return await client.request(method, url, **kwargs)
+
 
-    request_headers = headers.copy() if headers else {}
+async def proxied_stream(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    params: Optional[dict[str, Any]] = None,
+    data: Optional[dict[str, Any]] = None,
+    json: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    browser_mode: bool = False,
+    session_id: Optional[str] = None,
+    chunk_size: int = 65536,
+) -> AsyncIterator[bytes]:
+    """Make HTTP request through rotating proxy, yielding the body in chunks.
+
+    Unlike proxied_request(), the response body is never held in memory as a
+    whole, so this suits large responses that are scanned or written out as
+    they arrive.
+
+    Args:
+        method: HTTP method
+        url: Target URL
+        headers: Request headers
+        params: Query parameters
+        data: Form data
+        json: JSON body
+        timeout: Request timeout
+        browser_mode: Add realistic browser headers
+        session_id: Sticky session ID (None = new IP each request)
+        chunk_size: Size of the yielded chunks in bytes
+
+    Yields:
+        Chunks of the decoded response body
+
+    Raises:
+        httpx.HTTPStatusError: If the response status is 4xx or 5xx.
+    """
+    proxy_url, sticky, kwargs = _prepare_request(
+        headers, params, data, json, timeout, browser_mode, session_id
+    )
+    with _leased_client(proxy_url, sticky) as client:
+        async with client.stream(method, url, **kwargs) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+
+
+def _prepare_request(
+    headers: Optional[dict[str, str]],
+    params: Optional[dict[str, Any]],
+    data: Optional[dict[str, Any]],
+    json: Optional[dict[str, Any]],
+    timeout: Optional[float],
+    browser_mode: bool,
+    session_id: Optional[str],
+) -> tuple[str, bool, dict[str, Any]]:
+    """Pick the proxy URL for a request and build its keyword arguments.
+
+    Returns the proxy URL, whether it is a sticky session, and the kwargs.
+    """
+    settings = get_settings()
+    proxy_url = _proxy_url_for(settings, session_id)
+    sticky = proxy_url != settings.proxy_url
+
+    request_headers = headers
     if browser_mode:
-        for key, value in BROWSER_HEADERS.items():
-            if key not in request_headers:
-                request_headers[key] = value
-
-    kwargs: dict[str, Any] = {"headers": request_headers} if request_headers else {}
-    if params:
-        kwargs["params"] = params
-    if data:
-        kwargs["data"] = data
-    if json:
-        kwargs["json"] = json
-    if timeout:
-        kwargs["timeout"] = timeout
-
-    async with httpx.AsyncClient(
-        proxy=proxy_url,
-        timeout=httpx.Timeout(timeout or 30.0),
-        follow_redirects=True,
-        verify=False,  # Many proxy providers use self-signed certificates
-    ) as client:
-        return await client.request(method, url, **kwargs)
+        request_headers = {**BROWSER_HEADERS, **headers} if headers else BROWSER_HEADERS
+
+    # Empty values mean "not given", as before: an empty json dict must not
+    # become a "{}" request body.
+    kwargs = {
+        "headers": request_headers or None,
+        "params": params or None,
+        "data": data or None,
+        "json": json or None,
+        "timeout": timeout or httpx.USE_CLIENT_DEFAULT,
+    }
+    return proxy_url, sticky, kwargs
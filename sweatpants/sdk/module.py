@@ -1,7 +1,8 @@
 """Base module class for Sweatpants automation modules."""
 
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Optional, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Mapping, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from sweatpants.engine.job_scheduler import JobContext
@@ -21,6 +22,10 @@ class Module(ABC):
                     yield result
     """
 
+    # Subclasses that don't declare __slots__ still get a __dict__, so they
+    # can keep setting their own attributes freely.
+    __slots__ = ("_context", "_checkpoint")
+
     def __init__(self, context: "JobContext") -> None:
         self._context = context
         self._checkpoint: dict[str, Any] = {}
@@ -35,6 +40,14 @@ class Module(ABC):
         """Check if the job has been cancelled."""
         return self._context.is_cancelled
 
+    @property
+    def checkpoint(self) -> Mapping[str, Any]:
+        """Get a read-only view of the current checkpoint data.
+
+        Use save_checkpoint() or save_checkpoint_delta() to change it.
+        """
+        return MappingProxyType(self._checkpoint)
+
     async def log(self, message: str, level: str = "INFO") -> None:
         """Log a message for this job.
 
@@ -55,6 +68,23 @@ class Module(ABC):
         self._checkpoint.update(data)
         await self._context.save_checkpoint(self._checkpoint)
 
+    async def save_checkpoint_delta(self, **data: Any) -> None:
+        """Save only the given checkpoint keys.
+
+        Like save_checkpoint(), but only `data` is written rather than the
+        whole checkpoint, which keeps frequent checkpoints cheap when the
+        checkpoint is large.
+
+        Args:
+            **data: Key-value pairs to add to the checkpoint
+        """
+        self._checkpoint.update(data)
+        if any('"' in key for key in data):
+            # JSON paths can't name these keys; write the whole checkpoint.
+            await self._context.save_checkpoint(self._checkpoint)
+        else:
+            await self._context.save_checkpoint_delta(data)
+
     def get_checkpoint(self, key: str, default: Any = None) -> Any:
         """Get a value from the checkpoint.
 
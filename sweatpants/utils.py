@@ -1,6 +1,15 @@
 """Utility functions for Sweatpants."""
 
+import asyncio
 import re
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DURATION_RE = re.compile(r"^(\d+)([mhd])$")
+_DURATION_MULTIPLIERS = MappingProxyType({"m": 60, "h": 3600, "d": 86400})
 
 
 def parse_duration(duration: str) -> int:
@@ -15,10 +24,155 @@ def parse_duration(duration: str) -> int:
     Raises:
         ValueError: If format is invalid
     """
-    match = re.match(r"^(\d+)(m|h|d)$", duration)
+    match = _DURATION_RE.match(duration)
     if not match:
         raise ValueError(f"Invalid duration format: {duration}. Use: 30m, 2h, 24h, 7d")
 
-    value, unit = int(match.group(1)), match.group(2)
-    multipliers = {"m": 60, "h": 3600, "d": 86400}
-    return value * multipliers[unit]
+    value, unit = match.groups()
+    return int(value) * _DURATION_MULTIPLIERS[unit]
+
+
+# (whole second, formatted date and time) for the last second utc_timestamp saw.
+_timestamp_prefix: tuple[int, str] = (-1, "")
+
+
+def utc_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 string.
+
+    Matches datetime.now(timezone.utc).isoformat() (always with
+    microseconds), but the date and time part is only formatted once per
+    second.
+    """
+    global _timestamp_prefix
+    now = time.time()
+    second = int(now)
+    if second != _timestamp_prefix[0]:
+        _timestamp_prefix = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return f"{_timestamp_prefix[1]}.{int((now - second) * 1_000_000):06d}+00:00"
+
+
+class AsyncTTLCache:
+    """Short-lived cache for async lookups.
+
+    Values are kept for `ttl` seconds. Concurrent callers that miss on the
+    same key share a single in-flight load instead of each running it.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 128) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached value for key, calling loader on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+
+        # Shield so one caller going away does not cancel the shared load.
+        return await asyncio.shield(task)
+
+    def _store(self, key: Hashable, task: asyncio.Future) -> None:
+        """Cache the result of a finished load unless it was invalidated."""
+        if self._inflight.get(key) is not task:
+            return
+        del self._inflight[key]
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value and detach any load in flight for it."""
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached value and detach loads in flight."""
+        self._entries.clear()
+        self._inflight.clear()
+
+
+class BatchWriter(Generic[T]):
+    """Collects items and writes them in batches.
+
+    A batch is written as soon as `batch_size` items are pending, or in the
+    background `delay` seconds after the first pending item. Writes run one
+    at a time, in order. If a background write fails, the next flush()
+    raises its error.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], Awaitable[None]],
+        batch_size: int,
+        delay: float,
+    ) -> None:
+        self._write = write
+        self.batch_size = batch_size
+        self.delay = delay
+        self._pending: list[T] = []
+        self._lock = asyncio.Lock()
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._error: Optional[BaseException] = None
+
+    async def add(self, item: T) -> None:
+        """Queue an item, writing the batch if it is full."""
+        self._pending.append(item)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._handle is None:
+            self._handle = asyncio.get_running_loop().call_later(
+                self.delay, self._flush_later
+            )
+
+    def _flush_later(self) -> None:
+        """Timer callback: write the pending batch in the background."""
+        self._handle = None
+        task = asyncio.create_task(self._write_pending())
+        self._tasks.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        """Keep the first error of a background write for the next flush()."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None and self._error is None:
+            self._error = task.exception()
+
+    async def _write_pending(self) -> None:
+        # The batch is taken under the lock, so batches are written in order.
+        async with self._lock:
+            if self._pending:
+                batch, self._pending = self._pending, []
+                await self._write(batch)
+
+    async def flush(self) -> None:
+        """Write every pending item, after any background writes in flight.
+
+        Raises the error of a background write that failed since the last
+        flush, once the pending items have been written.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        error, self._error = self._error, None
+        try:
+            await self._write_pending()
+        finally:
+            if error is not None:
+                raise error
@@ -0,0 +1,24 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from sweatpants.config import get_settings
+from sweatpants.engine.state import StateManager, close_database, init_database
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings():
+    """Re-read settings in every test so monkeypatched env vars apply."""
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+async def state(tmp_path, monkeypatch):
+    """A state manager on a fresh database."""
+    monkeypatch.setenv("SWEATPANTS_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("SWEATPANTS_DB_PATH", str(tmp_path / "sweatpants.db"))
+    await init_database()
+    yield StateManager()
+    await close_database()
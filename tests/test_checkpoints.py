@@ -0,0 +1,90 @@
+"""Tests for saving job checkpoints, in full and as deltas."""
+
+import pytest
+
+from sweatpants.engine.job_scheduler import JobContext
+from sweatpants.sdk.module import Module
+
+
+class CheckpointModule(Module):
+    async def run(self, inputs, settings):
+        yield {}
+
+
+@pytest.fixture
+async def job_id(state):
+    return await state.create_job("checkpoint-module", {}, {})
+
+
+@pytest.fixture
+def module(state, job_id):
+    return CheckpointModule(JobContext(job_id=job_id, state=state))
+
+
+async def stored_checkpoint(state, job_id):
+    return (await state.get_job(job_id))["checkpoint"]
+
+
+@pytest.mark.asyncio
+async def test_merge_into_empty_checkpoint(state, job_id):
+    await state.merge_checkpoint(job_id, {"page": 1})
+
+    assert await stored_checkpoint(state, job_id) == {"page": 1}
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_other_keys_and_replaces_nested_values(state, job_id):
+    await state.update_job_status(
+        job_id, "running", checkpoint={"page": 1, "seen": {"a": 1}, "cursor": "x"}
+    )
+
+    await state.merge_checkpoint(job_id, {"seen": {"b": 2}, "cursor": None, "ids": [1, 2]})
+
+    assert await stored_checkpoint(state, job_id) == {
+        "page": 1,
+        "seen": {"b": 2},
+        "cursor": None,
+        "ids": [1, 2],
+    }
+
+
+@pytest.mark.asyncio
+async def test_merge_with_no_data_leaves_checkpoint_alone(state, job_id):
+    await state.merge_checkpoint(job_id, {})
+
+    assert await stored_checkpoint(state, job_id) is None
+
+
+@pytest.mark.asyncio
+async def test_save_checkpoint_delta_persists_only_changes(module, state, job_id):
+    await module.save_checkpoint(page=1, total=10)
+    await module.save_checkpoint_delta(page=2)
+
+    assert await stored_checkpoint(state, job_id) == {"page": 2, "total": 10}
+    assert module.get_checkpoint("page") == 2
+
+
+@pytest.mark.asyncio
+async def test_full_save_after_delta_writes_whole_checkpoint(module, state, job_id):
+    await module.save_checkpoint_delta(page=2)
+    await module.save_checkpoint(total=10)
+
+    assert await stored_checkpoint(state, job_id) == {"page": 2, "total": 10}
+
+
+@pytest.mark.asyncio
+async def test_save_checkpoint_delta_with_quoted_key(module, state, job_id):
+    await module.save_checkpoint_delta(page=1)
+    await module.save_checkpoint_delta(**{'say "hi"': True})
+
+    assert await stored_checkpoint(state, job_id) == {"page": 1, 'say "hi"': True}
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_property_is_a_read_only_live_view(module):
+    checkpoint = module.checkpoint
+    await module.save_checkpoint_delta(page=3)
+
+    assert checkpoint["page"] == 3
+    with pytest.raises(TypeError):
+        checkpoint["page"] = 4
@@ -1,5 +1,6 @@
 """Tests for configuration defaults."""
 
+import os
 from pathlib import Path
 
 from sweatpants.config import Settings, get_settings
@@ -55,3 +56,29 @@ def test_get_settings_respects_sweatpants_env_file(tmp_path, monkeypatch):
 
     assert settings.data_dir == Path(tmp_path / "from_env_file")
     assert settings.browser_pool_size == 7
+
+
+def test_load_modules_config_rereads_changed_file(tmp_path, monkeypatch):
+    config_path = tmp_path / "modules.yaml"
+    config_path.write_text("module_sources:\n  - repo: https://example.com/a.git\n")
+    monkeypatch.setenv("SWEATPANTS_MODULES_CONFIG_PATH", str(config_path))
+
+    settings = Settings()
+    first = settings.load_modules_config()
+
+    assert [s.repo for s in first.module_sources] == ["https://example.com/a.git"]
+    assert settings.load_modules_config() is first
+
+    config_path.write_text("module_sources:\n  - repo: https://example.com/b.git\n")
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert [s.repo for s in settings.load_modules_config().module_sources] == [
+        "https://example.com/b.git"
+    ]
+
+
+def test_load_modules_config_missing_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("SWEATPANTS_MODULES_CONFIG_PATH", str(tmp_path / "missing.yaml"))
+
+    assert Settings().load_modules_config() is None
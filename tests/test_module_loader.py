@@ -0,0 +1,147 @@
+"""Tests for module loader installs and syncs."""
+
+import shutil
+from pathlib import Path
+
+import orjson
+import pytest
+
+from sweatpants.engine import module_loader
+from sweatpants.engine.module_loader import ModuleLoader
+from sweatpants.engine.state import close_database, init_database
+
+REPO_URL = "https://example.com/org/modules.git"
+
+
+def write_module(path, module_id, requirements="requests\n"):
+    """Write a minimal module source directory."""
+    path.mkdir(parents=True)
+    manifest = {"id": module_id, "name": module_id, "version": "1.0.0", "entrypoint": "main.py"}
+    (path / "module.json").write_bytes(orjson.dumps(manifest))
+    (path / "main.py").write_text("")
+    if requirements is not None:
+        (path / "requirements.txt").write_text(requirements)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A source repository holding two modules."""
+    repo_path = tmp_path / "repo"
+    write_module(repo_path / "alpha", "alpha")
+    write_module(repo_path / "beta", "beta")
+    return repo_path
+
+
+@pytest.fixture
+def clones():
+    """Clone destinations passed to the fake git."""
+    return []
+
+
+@pytest.fixture
+def pip_runs(repo, clones, monkeypatch):
+    """Fake git and pip; git clones copy `repo`, pip runs are recorded."""
+    runs = []
+
+    async def fake_run(*args, timeout=None):
+        if args[0] == "git":
+            clones.append(Path(args[-1]))
+            shutil.copytree(repo, args[-1])
+        else:
+            runs.append(args)
+        return ""
+
+    monkeypatch.setattr(module_loader, "_run", fake_run)
+    return runs
+
+
+@pytest.fixture
+async def loader(tmp_path, monkeypatch):
+    """A module loader on a fresh data directory."""
+    data_dir = tmp_path / "data"
+    monkeypatch.setenv("SWEATPANTS_DATA_DIR", str(data_dir))
+    monkeypatch.setenv("SWEATPANTS_MODULES_DIR", str(data_dir / "modules"))
+    monkeypatch.setenv("SWEATPANTS_DB_PATH", str(data_dir / "sweatpants.db"))
+    monkeypatch.setenv("SWEATPANTS_MODULES_CONFIG_PATH", str(data_dir / "modules.yaml"))
+    (data_dir / "modules").mkdir(parents=True)
+    await init_database()
+    yield ModuleLoader()
+    await close_database()
+
+
+def write_sources(loader, *sources):
+    """Write modules.yaml listing (repo, modules) sources."""
+    lines = ["module_sources:"]
+    for repo_url, modules in sources:
+        lines.append(f"  - repo: {repo_url}")
+        lines.append("    modules:")
+        lines.extend(f"      - {name}" for name in modules)
+    loader.settings.modules_config_path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.asyncio
+async def test_sync_skips_pip_when_requirements_unchanged(loader, pip_runs):
+    write_sources(loader, (REPO_URL, ["alpha", "beta"]))
+
+    first = await loader.sync_modules()
+    second = await loader.sync_modules()
+
+    assert [m["id"] for m in first["installed"]] == ["alpha", "beta"]
+    assert [m["id"] for m in second["installed"]] == ["alpha", "beta"]
+    assert len(pip_runs) == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_reruns_pip_when_requirements_change(loader, pip_runs, repo):
+    write_sources(loader, (REPO_URL, ["alpha", "beta"]))
+    await loader.sync_modules()
+
+    (repo / "beta" / "requirements.txt").write_text("httpx\n")
+    await loader.sync_modules()
+
+    assert len(pip_runs) == 2
+    assert "alpha" not in " ".join(pip_runs[1])
+
+
+@pytest.mark.asyncio
+async def test_sync_registration_failure_skips_only_that_module(loader, pip_runs, monkeypatch):
+    write_sources(loader, (REPO_URL, ["alpha", "beta"]))
+    register = loader._register
+
+    async def failing_register(manifest, dest):
+        if manifest.id == "alpha":
+            raise RuntimeError("database is locked")
+        await register(manifest, dest)
+
+    monkeypatch.setattr(loader, "_register", failing_register)
+
+    result = await loader.sync_modules()
+
+    assert [m["id"] for m in result["installed"]] == ["beta"]
+    assert result["failed"] == [
+        {"module": "alpha", "source": REPO_URL, "error": "database is locked"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sync_rejects_second_source_of_same_module(loader, pip_runs, repo):
+    write_module(repo / "alpha-fork", "alpha", requirements=None)
+    (repo / "alpha-fork" / "fork.py").write_text("")
+    write_sources(loader, (REPO_URL, ["alpha", "alpha-fork", "beta"]))
+
+    result = await loader.sync_modules()
+
+    assert [m["id"] for m in result["installed"]] == ["alpha", "beta"]
+    assert [f["module"] for f in result["failed"]] == ["alpha-fork"]
+    assert "Duplicate module id 'alpha'" in result["failed"][0]["error"]
+    assert not (loader.settings.modules_dir / "alpha" / "fork.py").exists()
+
+
+@pytest.mark.asyncio
+async def test_sync_removes_clone_afterwards(loader, pip_runs, clones):
+    write_sources(loader, (REPO_URL, ["alpha"]))
+
+    await loader.sync_modules()
+
+    assert len(clones) == 1
+    assert not clones[0].parent.exists()
@@ -0,0 +1,38 @@
+"""Tests for the SQLite state manager."""
+
+from contextlib import aclosing
+
+import pytest
+
+from sweatpants.engine.state import JOB_FETCH_SIZE, get_connection
+
+
+@pytest.mark.asyncio
+async def test_iter_jobs_newest_first_uses_created_at_index(state):
+    first = await state.create_job("m", {}, {})
+    second = await state.create_job("m", {}, {})
+
+    jobs = [job["id"] async for job in state.iter_jobs()]
+
+    assert jobs == [second, first]
+    db = await get_connection(state._db_path)
+    plan = await db.execute_fetchall(
+        "EXPLAIN QUERY PLAN SELECT id FROM jobs ORDER BY created_at DESC"
+    )
+    assert any("idx_jobs_created_at" in row[-1] for row in plan)
+
+
+@pytest.mark.asyncio
+async def test_iter_jobs_closed_early_releases_its_snapshot(state):
+    # More than one fetch, so the query is still open after the first row.
+    for _ in range(JOB_FETCH_SIZE + 1):
+        await state.create_job("m", {}, {})
+
+    async with aclosing(state.iter_jobs()) as jobs:
+        async for _ in jobs:
+            break
+
+    # A read snapshot left open would make the checkpoint report busy.
+    db = await get_connection(state._db_path)
+    busy, _, _ = (await db.execute_fetchall("PRAGMA wal_checkpoint(TRUNCATE)"))[0]
+    assert busy == 0
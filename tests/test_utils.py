@@ -0,0 +1,158 @@
+"""Tests for utility helpers."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sweatpants.utils import AsyncTTLCache, BatchWriter, utc_timestamp
+
+
+def test_utc_timestamp_matches_isoformat():
+    """utc_timestamp should parse back to the current UTC time."""
+    before = datetime.now(timezone.utc)
+    stamp = utc_timestamp()
+    after = datetime.now(timezone.utc)
+
+    parsed = datetime.fromisoformat(stamp)
+    assert parsed.tzinfo == timezone.utc
+    assert before - timedelta(milliseconds=1) <= parsed <= after + timedelta(milliseconds=1)
+    assert stamp.endswith("+00:00")
+    assert len(stamp) == len("2024-01-15T10:30:00.000000+00:00")
+
+
+class TestAsyncTTLCache:
+    """Tests for AsyncTTLCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Callers missing on the same key should share a single load."""
+        cache = AsyncTTLCache(ttl=10.0)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": calls}
+
+        results = await asyncio.gather(*(cache.get("k", loader) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"value": 1} for r in results)
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self):
+        """Entries older than the TTL should be loaded again."""
+        cache = AsyncTTLCache(ttl=0.0)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await cache.get("k", loader) == 1
+        assert await cache.get("k", loader) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_inflight_result(self):
+        """A load that finishes after invalidation should not be cached."""
+        cache = AsyncTTLCache(ttl=10.0)
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return "stale"
+
+        async def fresh_loader():
+            return "fresh"
+
+        pending = asyncio.ensure_future(cache.get("k", slow_loader))
+        await asyncio.sleep(0)
+        cache.invalidate("k")
+        release.set()
+
+        assert await pending == "stale"
+        assert await cache.get("k", fresh_loader) == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """A failing load should propagate and leave nothing cached."""
+        cache = AsyncTTLCache(ttl=10.0)
+
+        async def failing_loader():
+            raise RuntimeError("boom")
+
+        async def loader():
+            return "ok"
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await cache.get("k", failing_loader)
+        assert await cache.get("k", loader) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_maxsize_evicts_oldest_entry(self):
+        """The oldest entry should be evicted once maxsize is reached."""
+        cache = AsyncTTLCache(ttl=10.0, maxsize=2)
+        calls = []
+
+        def loader_for(key):
+            async def loader():
+                calls.append(key)
+                return key
+
+            return loader
+
+        for key in ("a", "b", "c", "a"):
+            await cache.get(key, loader_for(key))
+
+        assert calls == ["a", "b", "c", "a"]
+
+
+class TestBatchWriter:
+    """Tests for BatchWriter."""
+
+    @pytest.mark.asyncio
+    async def test_writes_full_batches_and_flushes_the_rest(self):
+        """Full batches are written right away; flush() writes the remainder."""
+        batches = []
+
+        async def write(batch):
+            batches.append(batch)
+
+        writer = BatchWriter(write, batch_size=2, delay=10.0)
+        for item in range(5):
+            await writer.add(item)
+        assert batches == [[0, 1], [2, 3]]
+
+        await writer.flush()
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_failed_background_write_is_raised_by_flush(self):
+        """A background write that fails while a later one starts is not lost."""
+        release = asyncio.Event()
+        batches = []
+
+        async def write(batch):
+            if batch == ["first"]:
+                await release.wait()
+                raise RuntimeError("disk full")
+            batches.append(batch)
+
+        writer = BatchWriter(write, batch_size=100, delay=0.001)
+        await writer.add("first")
+        await asyncio.sleep(0.01)  # First background write is now blocked.
+        await writer.add("second")
+        await asyncio.sleep(0.01)  # Second background write waits its turn.
+        release.set()
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            await writer.flush()
+        assert batches == [["second"]]
+
+        # The error is reported once.
+        await writer.add("third")
+        await writer.flush()
+        assert batches == [["second"], ["third"]]